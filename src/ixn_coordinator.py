@@ -0,0 +1,139 @@
+"""
+IxNetwork controller coordinator - drive the IxNetwork sessions of multiple controllers concurrently.
+"""
+# pylint: disable=protected-access
+import copy
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from cloudshell.shell.core.driver_context import ResourceCommandContext
+from cloudshell.traffic.helpers import get_reservation_description
+from cloudshell.traffic.tg import is_blocking
+from trafficgenerator.tgn_utils import TgnError
+
+from ixn_statistics import merge_statistics
+from ixn_utils import TaskResult, log_task_results, run_concurrently
+
+if TYPE_CHECKING:
+    from ixn_handler import IxnHandler
+
+COORDINATOR_TIMEOUT = 600
+BLOCKING_TRAFFIC_TIMEOUT = 3600 * 24
+
+
+class IxnCoordinator:
+    """Run traffic and statistics commands on the coordinator controller and all coordinated controllers concurrently.
+
+    Coordinated controllers that are not running in this process are connected with the attributes of the controller
+    service with the same alias in the command reservation, in this case the API server session must already hold the
+    configuration (e.g. Windows API server default session).
+    """
+
+    # Controller services running in this process by resource name, coordinated controllers found here are driven
+    # through their own sessions.
+    controllers: "weakref.WeakValueDictionary[str, IxnHandler]" = weakref.WeakValueDictionary()
+
+    def __init__(self, handler: "IxnHandler", names: List[str]) -> None:
+        """Create coordinator, coordinated controllers are resolved on first command.
+
+        :param handler: Handler of the coordinator controller.
+        :param names: Names (service aliases) of coordinated controllers.
+        """
+        self.handler = handler
+        self.names = names
+        self.owned_handlers: Dict[str, "IxnHandler"] = {}
+        self.lock = threading.Lock()
+
+    def get_handlers(self, context: Optional[ResourceCommandContext]) -> Dict[str, "IxnHandler"]:
+        """Return {controller name: handler} of the coordinator and all coordinated controllers.
+
+        :param context: Command context, required only to resolve controllers that are not running in this process.
+        """
+        handlers = {self.handler.name: self.handler}
+        for name in self.names:
+            handlers[name] = IxnCoordinator.controllers.get(name) or self._get_owned_handler(context, name)
+        return handlers
+
+    def start_traffic(self, context: Optional[ResourceCommandContext], blocking: str, force_regenerate: str) -> None:
+        """Regenerate and apply traffic on all controllers, then start traffic on all controllers together.
+
+        Each controller waits on a start barrier after apply, so traffic start is aligned to the slowest apply instead of
+        accumulating all controllers apply and start durations.
+        """
+        handlers = self.get_handlers(context)
+        barrier = threading.Barrier(len(handlers))
+        released: Dict[str, float] = {}
+
+        def _start_traffic(name: str, handler: "IxnHandler") -> None:
+            try:
+                handler._prepare_traffic(force_regenerate)
+            except Exception:
+                barrier.abort()
+                raise
+            barrier.wait(COORDINATOR_TIMEOUT)
+            released[name] = time.time()
+            handler._start_traffic(blocking)
+
+        timeout = BLOCKING_TRAFFIC_TIMEOUT if is_blocking(blocking) else COORDINATOR_TIMEOUT
+        results = run_concurrently(_start_traffic, {name: (name, h) for name, h in handlers.items()}, timeout)
+        if released:
+            self.handler.logger.info(f"Traffic start skew {max(released.values()) - min(released.values()):.3f}s")
+        self._check_results("Start traffic", results)
+
+    def stop_traffic(self, context: Optional[ResourceCommandContext]) -> None:
+        """Stop traffic on all controllers."""
+        results = run_concurrently(
+            lambda h: h._stop_traffic(), {n: (h,) for n, h in self.get_handlers(context).items()}, COORDINATOR_TIMEOUT
+        )
+        self._check_results("Stop traffic", results)
+
+    def read_statistics(
+        self, context: Optional[ResourceCommandContext], view_name: str, table_key: Optional[str], delta: bool
+    ) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+        """Read the statistics view from all controllers and merge them into one table.
+
+        :return: (captions, {controller name/row key: {caption: value}})
+        """
+        results = run_concurrently(
+            lambda h: h._read_controller_statistics(view_name, table_key, delta),
+            {n: (h,) for n, h in self.get_handlers(context).items()},
+            COORDINATOR_TIMEOUT,
+        )
+        self._check_results(f"Read {view_name}", results)
+        return merge_statistics({name: result.result for name, result in results.items()})  # type: ignore[misc]
+
+    def cleanup(self) -> None:
+        """Disconnect from the API servers of coordinated controllers connected by the coordinator."""
+        with self.lock:
+            owned_handlers, self.owned_handlers = self.owned_handlers, {}
+        for handler in owned_handlers.values():
+            handler.disconnect()
+
+    def _get_owned_handler(self, context: Optional[ResourceCommandContext], name: str) -> "IxnHandler":
+        """Return handler connected (on first command) with the attributes of the coordinated controller service."""
+        with self.lock:
+            if name not in self.owned_handlers:
+                if not context or not getattr(context, "reservation", None):
+                    raise TgnError(f"Coordinated controller {name} is not running in this process and no reservation")
+                services = {service.Alias: service for service in get_reservation_description(context).Services}
+                if name not in services:
+                    raise TgnError(f"Coordinated controller {name} is not a service in the reservation - {list(services)}")
+                service_context = copy.copy(context)
+                service_context.resource = copy.copy(context.resource)
+                service_context.resource.name = name
+                service_context.resource.attributes = {a.Name: a.Value for a in services[name].Attributes}
+                service_context.resource.attributes["IxNetwork Controller Shell 2G.Lazy Connect"] = "True"
+                service_context.resource.attributes["IxNetwork Controller Shell 2G.Coordinated Controllers"] = ""
+                handler = type(self.handler)()
+                handler.initialize(service_context, self.handler.logger)
+                self.owned_handlers[name] = handler
+            return self.owned_handlers[name]
+
+    def _check_results(self, title: str, results: Dict[str, TaskResult]) -> None:
+        """Log results of all controllers and raise if any controller failed."""
+        log_task_results(self.handler.logger, title, results)
+        failed = [str(r) for r in results.values() if not r.ok]
+        if failed:
+            raise TgnError(f"{title} failed - {failed}")
@@ -1,11 +1,16 @@
+import sys
 from collections import defaultdict
+from types import MappingProxyType
 
 from cloudshell.shell.core.driver_context import AutoLoadAttribute, AutoLoadDetails, AutoLoadResource, ResourceCommandContext
 
 
 class LegacyUtils(object):
+    # Generated classes by class name, set once when the module is loaded (see end of module).
+    _datamodel_clss_dict = {}
+
     def __init__(self):
-        self._datamodel_clss_dict = self.__generate_datamodel_classes_dict()
+        pass
 
     def migrate_autoload_details(self, autoload_details, context):
         model_name = context.resource.model
@@ -26,49 +31,47 @@ class LegacyUtils(object):
         return d
 
     def __build_sub_resoruces_hierarchy(self, root, sub_resources, attributes):
-        d = defaultdict(list)
+        """
+        Build the resources tree iteratively (depth first), children are indexed by parent address in a single pass
+        """
+        children = defaultdict(list)
         for resource in sub_resources:
-            splitted = resource.relative_address.split("/")
-            parent = "" if len(splitted) == 1 else resource.relative_address.rsplit("/", 1)[0]
-            rank = len(splitted)
-            d[rank].append((parent, resource))
-
-        self.__set_models_hierarchy_recursively(d, 1, root, "", attributes)
-
-    def __set_models_hierarchy_recursively(self, dict, rank, manipulated_resource, resource_relative_addr, attributes):
-        if rank not in dict:  # validate if key exists
-            pass
-
-        for (parent, resource) in dict[rank]:
-            if parent == resource_relative_addr:
+            parent = resource.relative_address.rsplit("/", 1)[0] if "/" in resource.relative_address else ""
+            children[parent].append(resource)
+
+        stack = [(root, "")]
+        while stack:
+            manipulated_resource, resource_relative_addr = stack.pop()
+            sub_resources_stack = []
+            for resource in children.get(resource_relative_addr, []):
                 sub_resource = self.__create_resource_from_datamodel(resource.model.replace(" ", ""), resource.name)
                 self.__attach_attributes_to_resource(attributes, resource.relative_address, sub_resource)
                 manipulated_resource.add_sub_resource(
-                    self.__slice_parent_from_relative_path(parent, resource.relative_address), sub_resource
+                    self.__slice_parent_from_relative_path(resource_relative_addr, resource.relative_address), sub_resource
                 )
-                self.__set_models_hierarchy_recursively(dict, rank + 1, sub_resource, resource.relative_address, attributes)
+                sub_resources_stack.append((sub_resource, resource.relative_address))
+            stack.extend(reversed(sub_resources_stack))
 
     def __attach_attributes_to_resource(self, attributes, curr_relative_addr, resource):
-        for attribute in attributes[curr_relative_addr]:
+        for attribute in attributes.pop(curr_relative_addr, []):
             setattr(resource, attribute.attribute_name.lower().replace(" ", "_"), attribute.attribute_value)
-        del attributes[curr_relative_addr]
 
     def __slice_parent_from_relative_path(self, parent, relative_addr):
-        if parent is "":
+        if parent == "":
             return relative_addr
         return relative_addr[len(parent) + 1 :]  # + 1 because we want to remove the seperator also
 
-    def __generate_datamodel_classes_dict(self):
-        return dict(self.__collect_generated_classes())
-
-    def __collect_generated_classes(self):
+    @staticmethod
+    def generate_datamodel_classes_dict():
         import inspect
-        import sys
 
-        return inspect.getmembers(sys.modules[__name__], inspect.isclass)
+        return dict(inspect.getmembers(sys.modules[__name__], inspect.isclass))
 
 
 class IxNetwork_Controller_Shell_2G(object):
+    # Immutable attributes snapshots created from context, by resource name - (attributes fingerprint, snapshot).
+    _snapshots = {}
+
     def __init__(self, name):
         """ """
         self.attributes = {}
@@ -83,37 +86,45 @@ class IxNetwork_Controller_Shell_2G(object):
     def create_from_context(cls, context):
         """
         Creates an instance of NXOS by given context
+        Attributes are cached by resource name as an immutable snapshot, each instance gets its own writable copy
         :param context: cloudshell.shell.core.driver_context.ResourceCommandContext
         :type context: cloudshell.shell.core.driver_context.ResourceCommandContext
         :return:
         :rtype IxNetwork Controller Shell 2G
         """
-        result = IxNetwork_Controller_Shell_2G(name=context.resource.name)
-        for attr in context.resource.attributes:
-            result.attributes[attr] = context.resource.attributes[attr]
+        name = context.resource.name
+        fingerprint = tuple(context.resource.attributes.items())
+        cached = IxNetwork_Controller_Shell_2G._snapshots.get(name)
+        if not cached or cached[0] != fingerprint:
+            cached = (fingerprint, MappingProxyType({sys.intern(attr): value for attr, value in fingerprint}))
+            IxNetwork_Controller_Shell_2G._snapshots[name] = cached
+        result = IxNetwork_Controller_Shell_2G(name=name)
+        result.attributes = dict(cached[1])
         return result
 
     def create_autoload_details(self, relative_path=""):
         """
+        Collects resources and attributes of the whole sub-tree iteratively (depth first) into a single AutoLoadDetails
         :param relative_path:
         :type relative_path: str
         :return
         """
-        resources = [
-            AutoLoadResource(
-                model=self.resources[r].cloudshell_model_name,
-                name=self.resources[r].name,
-                relative_address=self._get_relative_path(r, relative_path),
+        resources = []
+        attributes = []
+        stack = [(self, relative_path)]
+        while stack:
+            model, path = stack.pop()
+            resources.extend(
+                AutoLoadResource(
+                    model=model.resources[r].cloudshell_model_name,
+                    name=model.resources[r].name,
+                    relative_address=model._get_relative_path(r, path),
+                )
+                for r in model.resources
             )
-            for r in self.resources
-        ]
-        attributes = [AutoLoadAttribute(relative_path, a, self.attributes[a]) for a in self.attributes]
-        autoload_details = AutoLoadDetails(resources, attributes)
-        for r in self.resources:
-            curr_path = relative_path + "/" + r if relative_path else r
-            curr_auto_load_details = self.resources[r].create_autoload_details(curr_path)
-            autoload_details = self._merge_autoload_details(autoload_details, curr_auto_load_details)
-        return autoload_details
+            attributes.extend(AutoLoadAttribute(path, a, model.attributes[a]) for a in model.attributes)
+            stack.extend(reversed([(model.resources[r], path + "/" + r if path else r) for r in model.resources]))
+        return AutoLoadDetails(resources, attributes)
 
     def _get_relative_path(self, child_path, parent_path):
         """
@@ -285,6 +296,63 @@ class IxNetwork_Controller_Shell_2G(object):
         """
         self.attributes["IxNetwork Controller Shell 2G.Test Files Location"] = value
 
+    @property
+    def session_pool_ttl(self):
+        """
+        :rtype: int
+        """
+        return (
+            self.attributes["IxNetwork Controller Shell 2G.Session Pool TTL"]
+            if "IxNetwork Controller Shell 2G.Session Pool TTL" in self.attributes
+            else None
+        )
+
+    @session_pool_ttl.setter
+    def session_pool_ttl(self, value=0):
+        """
+        Seconds to keep idle IxNetwork REST sessions for reuse by new reservations, 0 disables sessions reuse.
+        :type value: int
+        """
+        self.attributes["IxNetwork Controller Shell 2G.Session Pool TTL"] = value
+
+    @property
+    def lazy_connect(self):
+        """
+        :rtype: bool
+        """
+        return (
+            self.attributes["IxNetwork Controller Shell 2G.Lazy Connect"]
+            if "IxNetwork Controller Shell 2G.Lazy Connect" in self.attributes
+            else None
+        )
+
+    @lazy_connect.setter
+    def lazy_connect(self, value=False):
+        """
+        Connect to the API server on the first command that needs the server instead of on driver initialization.
+        :type value: bool
+        """
+        self.attributes["IxNetwork Controller Shell 2G.Lazy Connect"] = value
+
+    @property
+    def coordinated_controllers(self):
+        """
+        :rtype: str
+        """
+        return (
+            self.attributes["IxNetwork Controller Shell 2G.Coordinated Controllers"]
+            if "IxNetwork Controller Shell 2G.Coordinated Controllers" in self.attributes
+            else None
+        )
+
+    @coordinated_controllers.setter
+    def coordinated_controllers(self, value):
+        """
+        Comma separated names of IxNetwork controller resources to drive concurrently with this controller.
+        :type value: str
+        """
+        self.attributes["IxNetwork Controller Shell 2G.Coordinated Controllers"] = value
+
     @property
     def name(self):
         """
@@ -314,3 +382,6 @@ class IxNetwork_Controller_Shell_2G(object):
         :type value: str
         """
         self._cloudshell_model_name = value
+
+
+LegacyUtils._datamodel_clss_dict = LegacyUtils.generate_datamodel_classes_dict()
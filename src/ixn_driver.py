@@ -1,12 +1,13 @@
 """
 IxNetwork controller shell driver API. The business logic is implemented in ixn_handler.py.
 """
-# pylint: disable=unused-argument
-from typing import Optional, Union
+# pylint: disable=unused-argument, too-many-public-methods
+from typing import Dict, List, Optional, Union
 
 from cloudshell.shell.core.driver_context import CancellationContext, InitCommandContext, ResourceCommandContext
 from cloudshell.traffic.tg import TgControllerDriver, enqueue_keep_alive
 
+from ixn_coordinator import IxnCoordinator
 from ixn_handler import IxnHandler
 
 
@@ -22,9 +23,11 @@ class IxNetworkController2GDriver(TgControllerDriver):
         """Initialize IxNetwork controller shell (from API)."""
         super().initialize(context)
         self.handler.initialize(context, self.logger)
+        IxnCoordinator.controllers[context.resource.name] = self.handler
 
     def cleanup(self) -> None:
         """Cleanup IxNetwork controller shell (from API)."""
+        IxnCoordinator.controllers.pop(self.handler.name, None)
         self.handler.cleanup()
         super().cleanup()
 
@@ -45,19 +48,97 @@ class IxNetworkController2GDriver(TgControllerDriver):
         """Stop all protocols (classic and ngpf) on all ports."""
         self.handler.stop_protocols()
 
-    def start_traffic(self, context: ResourceCommandContext, blocking: str) -> None:
-        """Start traffic on all ports."""
-        self.handler.start_traffic(blocking)
+    def start_protocols_scoped(
+        self, context: ResourceCommandContext, scope: str, timeout: Optional[str] = "120"
+    ) -> Dict[str, dict]:
+        """Start protocols of selected topologies, device groups or ports and wait until all of them are started.
+
+        :param scope: comma separated list of topologies, device groups or ports names
+        :param timeout: max time (seconds) to wait for all selected objects to start
+        """
+        return self.handler.start_protocols_scoped(scope, timeout or "120")
+
+    def stop_protocols_scoped(
+        self, context: ResourceCommandContext, scope: str, timeout: Optional[str] = "120"
+    ) -> Dict[str, dict]:
+        """Stop protocols of selected topologies, device groups or ports and wait until all of them are stopped.
+
+        :param scope: comma separated list of topologies, device groups or ports names
+        :param timeout: max time (seconds) to wait for all selected objects to stop
+        """
+        return self.handler.stop_protocols_scoped(scope, timeout or "120")
+
+    def start_traffic(self, context: ResourceCommandContext, blocking: str, force_regenerate: Optional[str] = "False") -> None:
+        """Start traffic on all ports.
+
+        :param force_regenerate: True - always regenerate and apply traffic, False - only if traffic might have changed
+        """
+        self.handler.start_traffic(context, blocking, force_regenerate)
 
     def stop_traffic(self, context: ResourceCommandContext) -> None:
         """Stop traffic on all ports."""
-        self.handler.stop_traffic()
-
-    def get_statistics(
-        self, context: ResourceCommandContext, view_name: str, output_type: str, table_key: Optional[str]
+        self.handler.stop_traffic(context)
+
+    def get_statistics(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        context: ResourceCommandContext,
+        view_name: str,
+        output_type: str,
+        table_key: Optional[str],
+        delta: Optional[str] = "False",
+        columns: Optional[str] = None,
+        key_filter: Optional[str] = None,
+        value_filter: Optional[str] = None,
     ) -> Union[dict, str]:
-        """Get view statistics."""
-        return self.handler.get_statistics(context, view_name, output_type, table_key)
+        """Get view statistics.
+
+        :param delta: True - return only rows that changed since the previous call, with rate columns, False - full view.
+        :param columns: comma separated list of captions to return, if empty return all columns
+        :param key_filter: regular expression, return only rows with matching row key
+        :param value_filter: semicolon separated numeric conditions (e.g. Loss % > 0), return only matching rows
+        """
+        return self.handler.get_statistics(
+            context, view_name, output_type, table_key, delta, columns, key_filter, value_filter
+        )
+
+    def get_traffic_verdict(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        context: ResourceCommandContext,
+        view_name: Optional[str] = "Traffic Item Statistics",
+        max_loss: Optional[str] = None,
+        max_min_latency: Optional[str] = None,
+        max_avg_latency: Optional[str] = None,
+        max_max_latency: Optional[str] = None,
+        min_rx_rate: Optional[str] = None,
+    ) -> dict:
+        """Get traffic pass/fail verdict and the rows that violate the thresholds, empty thresholds are not evaluated.
+
+        :param max_loss: max allowed Loss %
+        :param max_min_latency: max allowed min latency (ns)
+        :param max_avg_latency: max allowed average latency (ns)
+        :param max_max_latency: max allowed max latency (ns)
+        :param min_rx_rate: min allowed Rx frame rate
+        """
+        thresholds = {
+            "loss": max_loss,
+            "min_latency": max_min_latency,
+            "avg_latency": max_avg_latency,
+            "max_latency": max_max_latency,
+            "rx_rate": min_rx_rate,
+        }
+        return self.handler.get_traffic_verdict(view_name or "Traffic Item Statistics", thresholds)
+
+    def start_stats_recording(self, context: ResourceCommandContext, view_names: str, interval: str) -> None:
+        """Start recording statistics views in the background.
+
+        :param view_names: comma separated list of view names, for user defined views add the table key after colon
+        :param interval: sampling interval in seconds
+        """
+        self.handler.start_stats_recording(view_names, interval)
+
+    def stop_stats_recording(self, context: ResourceCommandContext) -> List[str]:
+        """Stop statistics recording and attach the recorded files to the reservation."""
+        return self.handler.stop_stats_recording(context)
 
     def run_quick_test(self, context: ResourceCommandContext, test: str) -> None:
         """Run quick test in blocking mode.
@@ -66,6 +147,34 @@ class IxNetworkController2GDriver(TgControllerDriver):
         """
         self.handler.run_quick_test(context, test)
 
+    def run_quick_tests(self, context: ResourceCommandContext, tests: str) -> str:
+        """Run multiple quick tests in blocking mode and attach reports and summary.
+
+        :param tests: comma separated list of quick tests names to run
+        """
+        return self.handler.run_quick_tests(context, tests)
+
+    def start_quick_test(self, context: ResourceCommandContext, test: str) -> None:
+        """Start quick test and return immediately.
+
+        :param test: name of quick test to start
+        """
+        self.handler.start_quick_test(test)
+
+    def get_quick_test_status(self, context: ResourceCommandContext, test: str) -> dict:
+        """Get quick test running status and progress.
+
+        :param test: name of quick test
+        """
+        return self.handler.get_quick_test_status(test)
+
+    def collect_quick_test_results(self, context: ResourceCommandContext, test: str) -> str:
+        """Attach quick test report to the reservation.
+
+        :param test: name of completed quick test
+        """
+        return self.handler.collect_quick_test_results(context, test)
+
     def keep_alive(self, context: ResourceCommandContext, cancellation_context: CancellationContext) -> None:
         """Keep IxNetwork controller shell sessions alive (from TG controller API).
 
@@ -92,3 +201,44 @@ class IxNetworkController2GDriver(TgControllerDriver):
     def set_attribute(self, context: ResourceCommandContext, obj_ref: str, attr_name: str, attr_value: str) -> None:
         """Set traffic generator object attribute - API only command."""
         self.handler.set_attribute(obj_ref, attr_name, attr_value)
+
+    def set_object_cache(self, context: ResourceCommandContext, ttl: str, max_entries: Optional[str] = "1024") -> None:
+        """Configure get_children/get_attributes cache - API only command.
+
+        :param ttl: time to live of cache entries in seconds, 0 disables the cache
+        :param max_entries: max number of cached entries
+        """
+        self.handler.set_object_cache(ttl, max_entries)
+
+    def get_object_cache_statistics(self, context: ResourceCommandContext) -> Dict[str, float]:
+        """Get get_children/get_attributes cache hit/miss counters - API only command."""
+        return self.handler.get_object_cache_statistics()
+
+    def get_attributes_bulk(self, context: ResourceCommandContext, obj_refs: str) -> Dict[str, dict]:
+        """Get attributes of multiple objects - API only command.
+
+        :param obj_refs: JSON list of object references or [object reference, [attribute names]] pairs
+        """
+        return self.handler.get_attributes_bulk(obj_refs)
+
+    def set_attributes_bulk(self, context: ResourceCommandContext, attributes: str) -> None:
+        """Set attributes of multiple objects - API only command.
+
+        :param attributes: JSON list of [object reference, {attribute name: attribute value}] pairs
+        """
+        self.handler.set_attributes_bulk(attributes)
+
+    def get_subtree(self, context: ResourceCommandContext, obj_ref: str, depth: str, child_types: Optional[str]) -> dict:
+        """Get object and descendants attributes - API only command.
+
+        :param depth: max depth of descendants to return
+        :param child_types: comma separated list of descendants types to return, if empty return all types
+        """
+        return self.handler.get_subtree(obj_ref, depth, child_types)
+
+    def get_performance_metrics(self, context: ResourceCommandContext, prometheus_file: Optional[str]) -> Dict[str, dict]:
+        """Get commands latencies and REST requests counters - API only command.
+
+        :param prometheus_file: full path of Prometheus text file to write, if empty do not write file
+        """
+        return self.handler.get_performance_metrics(prometheus_file)
@@ -1,165 +1,928 @@
 """
 IxNetwork controller handler.
 """
-import csv
-import io
+import functools
 import json
 import logging
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from os import path
 from pathlib import Path
-from typing import Optional, Union
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
 
+import requests
+from cloudshell.api.cloudshell_api import ReservedResourceInfo
 from cloudshell.shell.core.driver_context import InitCommandContext, ResourceCommandContext
 from cloudshell.shell.core.session.cloudshell_session import CloudShellSessionContext
-from cloudshell.traffic.helpers import get_family_attribute, get_location, get_resources_from_reservation
+from cloudshell.traffic.helpers import get_cs_session, get_family_attribute, get_location, get_resources_from_reservation
 from cloudshell.traffic.tg import IXIA_CHASSIS_MODEL, PERFECT_STORM_CHASSIS_MODEL, attach_stats_csv, is_blocking
-from ixnetwork.ixn_app import IxnApp, init_ixn
-from ixnetwork.ixn_statistics_view import IxnFlowStatistics, IxnPortStatistics, IxnStatisticsView, IxnTrafficItemStatistics
-from trafficgenerator.tgn_utils import ApiType, TgnError
+from trafficgenerator.tgn_utils import ApiType, TgnError, is_local_host, is_true
 
+from ixn_coordinator import IxnCoordinator
 from ixn_data_model import IxNetwork_Controller_Shell_2G
+from ixn_metrics import PerformanceMetrics, measured
+from ixn_polling import get_poll_scheduler
+from ixn_quick_tests import IxnQuickTests
+from ixn_session_pool import SessionKey, config_uploads, session_pool
+from ixn_statistics import (
+    IxnStatisticsReader,
+    IxnStatisticsRecorder,
+    IxnStatisticsTable,
+    StatisticsQueryError,
+    check_thresholds,
+    dict_rows,
+    iter_csv,
+    parse_conditions,
+    select_statistics,
+    statistics_to_json,
+    traffic_verdict,
+)
+from ixn_utils import (
+    ROOT_LOCK,
+    ObjectCache,
+    UploadCache,
+    bound_root,
+    delete_file,
+    file_hash,
+    log_task_results,
+    prune_subtree,
+    run_concurrently,
+    upload_file,
+)
+
+if TYPE_CHECKING:
+    from ixnetwork.api.ixn_rest import IxnRestWrapper
+    from ixnetwork.ixn_app import IxnApp
+    from ixnetwork.ixn_port import IxnPort
 
 IXIA_PORT_MODELS = [
     f"{PERFECT_STORM_CHASSIS_MODEL}.GenericTrafficGeneratorPort",
     f"{IXIA_CHASSIS_MODEL}.GenericTrafficGeneratorPort",
 ]
 
+RELEASE_PORTS_TIMEOUT = 60
+RESERVE_PORTS_TIMEOUT = 120
+FORCE_CLEAR_TIMEOUT = 20
+SET_ATTRIBUTES_TIMEOUT = 120
+CONFIG_UPLOADS_MAX_BYTES = 512 * 1024 * 1024
+TRAFFIC_STATE_TIMEOUT = 16
+TRAFFIC_RUN_TIMEOUT = 2.628e6
+TRAFFIC_START_SETTLE_TIME = 2
+OPERATION_TIMEOUT = 128
+PROTOCOLS_STATUS = {"start": "started", "stop": "notStarted"}
+
+T = TypeVar("T")
 
+
+# pylint: disable=too-many-public-methods, too-many-instance-attributes
 class IxnHandler:
     """IxNetwork controller shell business logic."""
 
     def __init__(self) -> None:
         """Initialize object variables, actual initialization is performed in initialize method."""
-        self.ixn: IxnApp = None
+        self._ixn: Optional["IxnApp"] = None
+        self.connect_lock = Lock()
+        self.connect_args: dict = {}
+        self.license_server: Optional[str] = None
         self.logger: logging.Logger = None
+        self.name = ""
+        self.coordinator: Optional[IxnCoordinator] = None
+        self.config_hash: Optional[str] = None
+        self.port_locations: Dict[str, str] = {}
+        self.statistics_readers: Dict[Tuple[str, Optional[str]], IxnStatisticsReader] = {}
+        self.statistics_recorder: Optional[IxnStatisticsRecorder] = None
+        self.object_cache = ObjectCache()
+        self.traffic_applied = False
+        self.quick_tests = IxnQuickTests(self)
+        self.session_key: SessionKey = None
+        self.session_ttl = 0.0
+        self.metrics = PerformanceMetrics()
+        self.wait_durations: Dict[str, float] = {}
+
+    @property
+    def ixn(self) -> "IxnApp":
+        """Return IxnApp connected to IxNetwork API server, in lazy connect mode connect on first access."""
+        if not self._ixn:
+            with self.connect_lock:
+                if not self._ixn:
+                    self._connect()
+        return self._ixn
 
+    @measured
     def initialize(self, context: InitCommandContext, logger: logging.Logger) -> None:
-        """Init IxnApp and connect to IxNetwork API server."""
+        """Init IxnApp and connect to IxNetwork API server, in lazy connect mode only save the connection parameters."""
         self.logger = logger
+        self.name = context.resource.name
 
         service = IxNetwork_Controller_Shell_2G.create_from_context(context)
 
-        self.ixn = init_ixn(ApiType.rest, self.logger)
-
         api_server = service.address if service.address else "localhost"
         api_port = service.controller_tcp_port if service.controller_tcp_port else "11009"
+        self.license_server = service.license_server
         if api_port == "443":
             user = service.user
             password = CloudShellSessionContext(context).get_api().DecryptPassword(service.password).Value
             auth = (user, password)
-            if not service.license_server:
-                service.license_server = "localhost"
+            if not self.license_server:
+                self.license_server = "localhost"
         else:
             auth = None
-        self.logger.debug(f"Connecting to API server {api_server} at {api_port} port with auth {auth}")
-        self.ixn.connect(api_server=api_server, api_port=int(api_port), auth=auth)
-        if service.license_server:
-            self.ixn.api.set_licensing(licensing_servers=[service.license_server])
+        self.session_key = (api_server, int(api_port), auth[0] if auth else None)
+        self.session_ttl = float(service.session_pool_ttl) if service.session_pool_ttl else 0
+        self.connect_args = {"api_server": api_server, "api_port": int(api_port), "auth": auth}
+        if service.coordinated_controllers:
+            names = [name.strip() for name in service.coordinated_controllers.split(",") if name.strip()]
+            self.logger.info(f"Coordinator mode - traffic and statistics commands run also on {names}")
+            self.coordinator = IxnCoordinator(self, names)
+        if service.lazy_connect and is_true(service.lazy_connect):
+            self.logger.info(f"Lazy connect - connect to API server {api_server} on first command")
+        else:
+            self._connect()
+
+    @contextmanager
+    def _bound_root(self) -> Iterator[None]:
+        """Bind pyixnetwork objects discovery to the handler session, other handlers discovery waits until exit.
+
+        The session is connected (lazy connect) before the root lock is taken, connect takes the root lock itself.
+        """
+        with bound_root(self.ixn.root):
+            yield
+
+    def _connect(self) -> None:
+        """Connect to IxNetwork API server, or reuse pooled session, and set licensing."""
+        from ixnetwork.ixn_app import init_ixn  # pylint: disable=import-outside-toplevel
+
+        ixn = session_pool.acquire(self.session_key, self.logger) if self.session_ttl else None
+        if not ixn:
+            ixn = init_ixn(ApiType.rest, self.logger)
+            self.logger.debug(f"Connecting to API server with {self.connect_args}")
+            with ROOT_LOCK:
+                ixn.connect(**self.connect_args)
+        ixn.api.request = self.metrics.wrap_rest(ixn.api.request)
+        ixn.api.wait_for_complete = functools.partial(self._wait_for_complete, ixn.api)
+        if self.license_server:
+            ixn.api.set_licensing(licensing_servers=[self.license_server])
+        self._ixn = ixn
+
+    def _wait(self, name: str, poll: Callable[[], bool], timeout: float, expected_key: Optional[str] = None) -> bool:
+        """Wait with the API server poll scheduler and add the number of polls to the running command metrics.
+
+        Polling tightens around the duration of the previous completed wait with the same name, or the same expected_key
+        for waits with different durations (e.g. per quick test).
+
+        :param name: Wait name for poll counters.
+        :param poll: Returns True when the wait is complete.
+        :param timeout: Max wait time in seconds.
+        :param expected_key: Key of the wait duration to learn and expect, default is the wait name.
+        :return: True if the wait completed, False if the timeout expired.
+        """
+        expected_key = expected_key or name
+        scheduler = get_poll_scheduler(f"{self.connect_args['api_server']}:{self.connect_args['api_port']}")
+        start = time.time()
+        polls = scheduler.wait(name, poll, timeout, self.wait_durations.get(expected_key))
+        self.metrics.add_polls(name, abs(polls))
+        if polls > 0:
+            self.wait_durations[expected_key] = time.time() - start
+        return polls > 0
 
+    def _wait_for_complete(
+        self, api: "IxnRestWrapper", response: requests.Response, timeout: int = OPERATION_TIMEOUT
+    ) -> requests.Response:
+        """Wait for non-blocking REST operation to complete, replaces IxnRestWrapper.wait_for_complete fixed 1s polling."""
+        progress_url = response.json()["url"]
+        if "http" not in progress_url:
+            # Sometimes the progress url is relative, for example in version 8.50 linux loadconfig.
+            progress_url = api.server_url + progress_url
+        responses = [response]
+
+        def _is_complete(response: requests.Response) -> bool:
+            data = response.json()
+            data = data if isinstance(data, dict) else data[0]
+            if "errors" in data:
+                raise TgnError(data["errors"][0])
+            state = data.get("state", "").lower()
+            if state == "error":
+                raise TgnError(f"wait for post {response.url} failed - {data['result'].strip()}")
+            return state == "success"
+
+        def _poll() -> bool:
+            responses[0] = api.get(progress_url)
+            return _is_complete(responses[0])
+
+        if not _is_complete(response):
+            if not self._wait("operation", _poll, timeout, re.sub(r"/[0-9]+", "", progress_url)):
+                state = responses[0].json()
+                raise TgnError(f"{api.session} operation failed, state is {state} after {timeout} seconds")
+        return responses[0]
+
+    @measured
     def cleanup(self) -> None:
-        """Release all ports and disconnect from IxNetwork API server."""
-        for port in self.ixn.root.ports.values():
-            port.release()
-        self.ixn.disconnect()
+        """Release all ports and disconnect from IxNetwork API server or return the session to the sessions pool."""
+        if self.coordinator:
+            self.coordinator.cleanup()
+        if not self._ixn:
+            self.logger.info("Never connected to API server - nothing to clean")
+            return
+        if self.statistics_recorder:
+            self.statistics_recorder.stop()
+            self.statistics_recorder.remove_files()
+            self.statistics_recorder = None
+        released = False
+        try:
+            with self._bound_root():
+                ports = list(self.ixn.root.ports.values())
+            with self.metrics.phase("chassis"):
+                released = self._release_ports_on_cleanup(ports)
+        finally:
+            ixn, self._ixn = self._ixn, None
+            if self.session_ttl and released:
+                session_pool.release(self.session_key, ixn, self.session_ttl)
+            else:
+                config_uploads.pop(ixn.api.root_url, None)
+                ixn.disconnect()
+        self.port_locations = {}
+        self._invalidate(config_changed=True)
+
+    def _invalidate(self, config_changed: bool = False, quick_tests_changed: bool = True) -> None:
+        """Drop cached objects and mark traffic as not applied, call before any command that may change the configuration.
+
+        :param config_changed: True - the command changes the configuration so it no longer matches the loaded file, the
+            next load_config must reload the file and statistics views must be resolved again.
+        :param quick_tests_changed: False - the command only applies/runs quick tests, applied quick tests remain applied.
+        """
+        if config_changed:
+            self.config_hash, self.statistics_readers = None, {}
+            if quick_tests_changed:
+                self.quick_tests.applied.clear()
+        self.object_cache.clear()
+        self.traffic_applied = False
 
+    def disconnect(self) -> None:
+        """Disconnect from IxNetwork API server without releasing ports."""
+        if self._ixn:
+            config_uploads.pop(self._ixn.api.root_url, None)
+            self._ixn.disconnect()
+            self._ixn = None
+
+    @measured
     def load_config(self, context: ResourceCommandContext, ixia_config_file_name: str) -> None:
-        """Load IxNetwork configuration file, and map and reserve ports."""
-        self.ixn.load_config(Path(ixia_config_file_name))
-        config_ports = self.ixn.root.ports.values()
+        """Load IxNetwork configuration file, and map and reserve ports.
+
+        If the same configuration file (by content) is already loaded skip the reload and re-reserve only ports that
+        were mapped to a different physical location.
+        """
+        if self.statistics_recorder and self.statistics_recorder.is_recording:
+            self.statistics_recorder.stop()
+        config_file = Path(ixia_config_file_name)
+        config_hash = file_hash(config_file)
+        loaded_hash, loaded_port_locations = self.config_hash, self.port_locations
+        self.port_locations = {}
+        self._invalidate(config_changed=True)
+        if config_hash == loaded_hash:
+            self.logger.info(f"Configuration {config_file} already loaded - skip reload")
+        else:
+            self._load_config_file(config_file, config_hash)
+            loaded_port_locations = {}
+        with self._bound_root():
+            config_ports = self.ixn.root.ports
+
+        with self.metrics.phase("cloudshell"):
+            reservation_ports = self._get_reservation_ports(context)
+
+        locations = {}
+        offline_ports = []
+        for name, port in config_ports.items():
+            if name not in reservation_ports:
+                raise TgnError(f'Configuration port "{port}" not found in reservation ports {reservation_ports.keys()}')
+            locations[name] = get_location(reservation_ports[name])
+            if "offline-debug" in reservation_ports[name].Name.lower():
+                offline_ports.append(name)
 
-        for port in config_ports:
-            port.release()
+        changed_locations = {n: loc for n, loc in locations.items() if loaded_port_locations.get(n) != loc}
+        for name, location in changed_locations.items():
+            self.logger.info(f"Logical Port {name} will be reserved on Physical location {location}")
+            if name in offline_ports:
+                self.logger.debug(f"Offline debug port {location} - no actual reservation")
+        with self.metrics.phase("chassis"):
+            self._release_ports([config_ports[name] for name in changed_locations])
+            self._reserve_ports({n: (config_ports[n], loc) for n, loc in changed_locations.items() if n not in offline_ports})
+        self.config_hash, self.port_locations = config_hash, locations
+        self.logger.info("Port Reservation Completed")
+
+    def _load_config_file(self, config_file: Path, config_hash: str) -> None:
+        """Load configuration file, upload the file only if the same content was not uploaded to the session before.
+
+        The configuration is loaded with IxnApp.load_config, with the REST upload and load replaced by load of the
+        uploaded file, and the root is bound to the handler session only for the ports discovery that follows the load.
+        """
+        uploads = config_uploads.setdefault(self.ixn.api.root_url, UploadCache(CONFIG_UPLOADS_MAX_BYTES))
+        cached_file_name = uploads.get(config_hash)
+        if cached_file_name:
+            self.logger.info(f"Configuration {config_file} already uploaded as {cached_file_name} - skip upload")
+        file_name = cached_file_name or self._upload_config_file(config_file, config_hash, uploads)
+        with ExitStack() as root_binding:
+
+            def _load_uploaded_config(uploaded_file_name: str) -> None:
+                load_config_url = f"{self.ixn.api.root_url}ixnetwork/operations/loadconfig"
+                try:
+                    self.ixn.api.post(load_config_url, data={"arg1": path.basename(uploaded_file_name)})
+                except TgnError as error:
+                    if not cached_file_name:
+                        raise
+                    self.logger.warning(f"Failed to load uploaded configuration {cached_file_name}, upload again - {error}")
+                    uploads.remove(config_hash)
+                    reuploaded_file_name = self._upload_config_file(config_file, config_hash, uploads)
+                    self.ixn.api.post(load_config_url, data={"arg1": reuploaded_file_name})
+                root_binding.enter_context(self._bound_root())
+
+            self.ixn.api.loadConfig = _load_uploaded_config
+            try:
+                self.ixn.load_config(Path(file_name))
+            finally:
+                del self.ixn.api.loadConfig
+
+    def _upload_config_file(self, config_file: Path, config_hash: str, uploads: UploadCache) -> str:
+        """Stream configuration file to the session files and return the server side file name.
+
+        Files evicted from the uploads cache to keep the uploads within the size budget are deleted from the server.
+        """
+        file_name = f"{config_hash[:16]}-{config_file.name}"
+        size = config_file.stat().st_size
+        start = time.time()
+        upload_file(self.ixn.api, config_file, file_name)
+        self.logger.info(f"Uploaded {config_file} as {file_name} - {size} bytes in {time.time() - start:.2f}s")
+        for evicted_file_name in uploads.add(config_hash, file_name, size):
+            try:
+                delete_file(self.ixn.api, evicted_file_name)
+            except TgnError as error:
+                self.logger.warning(f"Failed to delete evicted configuration {evicted_file_name} - {error}")
+        self.logger.debug(f"Uploaded configurations cache size {uploads.size} bytes")
+        return file_name
+
+    def _get_reservation_ports(self, context: ResourceCommandContext) -> Dict[str, ReservedResourceInfo]:
+        """Return {logical name: reservation port} for all Ixia ports in the reservation.
+
+        Read the Logical Name attribute of all ports with a single GetResourceDetails call per chassis instead of one
+        call per port, fall back to per port query for ports missing from the chassis details.
+        """
+        ports = get_resources_from_reservation(context, *IXIA_PORT_MODELS)
+        cs_session = get_cs_session(context)
+        logical_names = {}
+        for chassis_name in {p.Name.split("/")[0] for p in ports}:
+            resources = [cs_session.GetResourceDetails(chassis_name)]
+            while resources:
+                resource = resources.pop()
+                resources.extend(resource.ChildResources)
+                for attribute in resource.ResourceAttributes:
+                    if attribute.Name == "Logical Name" or attribute.Name.endswith(".Logical Name"):
+                        logical_names[resource.Name] = attribute.Value
 
         reservation_ports = {}
-        for port in get_resources_from_reservation(context, *IXIA_PORT_MODELS):
-            reservation_ports[get_family_attribute(context, port.Name, "Logical Name").strip()] = port
-
-        for port in config_ports:
-            if port.name in reservation_ports:
-                location = get_location(reservation_ports[port.name])
-                self.logger.info(f"Logical Port {port.name} will be reserved on Physical location {location}")
-                if "offline-debug" not in reservation_ports[port.name].Name.lower():
-                    port.reserve(location, wait_for_up=False)
-                else:
-                    self.logger.debug(f"Offline debug port {location} - no actual reservation")
+        for port in ports:
+            if port.Name in logical_names:
+                logical_name = logical_names[port.Name]
             else:
-                raise TgnError(f'Configuration port "{port}" not found in reservation ports {reservation_ports.keys()}')
+                logical_name = get_family_attribute(context, port.Name, "Logical Name")
+            reservation_ports[logical_name.strip()] = port
+        return reservation_ports
 
-        for port in config_ports:
-            if "offline-debug" not in reservation_ports[port.name].Name.lower():
-                port.wait_for_states(40, "up")
+    def _release_ports(self, ports: List["IxnPort"]) -> None:
+        """Release ports concurrently."""
+        deadline = time.time() + RELEASE_PORTS_TIMEOUT
+        results = run_concurrently(self._release_port, {p.name: (p, deadline) for p in ports}, RELEASE_PORTS_TIMEOUT)
+        log_task_results(self.logger, "Release ports", results)
+        failed = [str(r) for r in results.values() if not r.ok]
+        if failed:
+            raise TgnError(f"Failed to release ports - {failed}")
 
-        self.logger.info("Port Reservation Completed")
+    def _release_ports_on_cleanup(self, ports: List["IxnPort"]) -> bool:
+        """Release ports concurrently within RELEASE_PORTS_TIMEOUT and force clear ownership of unreleased ports.
+
+        Never raises so the session is always disconnected after cleanup, waits for the workers so none outlives cleanup.
+
+        :return: True if all ports were released gracefully, else False.
+        """
+        deadline = time.time() + RELEASE_PORTS_TIMEOUT
+        tasks = {p.name: (p, deadline) for p in ports}
+        results = run_concurrently(self._release_port, tasks, RELEASE_PORTS_TIMEOUT, join=True)
+        log_task_results(self.logger, "Release ports on cleanup", results)
+        unreleased = [p for p in ports if not results[p.name].ok]
+        if not unreleased:
+            return True
 
+        def _clear_ownership(port: "IxnPort") -> None:
+            hw_port = port.get_attribute("connectedTo")
+            if hw_port != port.api.null:
+                port.api.execute("clearOwnership", hw_port, True, [hw_port])
+
+        results = run_concurrently(_clear_ownership, {p.name: (p,) for p in unreleased}, FORCE_CLEAR_TIMEOUT, join=True)
+        log_task_results(self.logger, "Force clear ownership of unreleased ports", results)
+        return False
+
+    def _release_port(self, port: "IxnPort", deadline: float) -> None:
+        """Release port, if still connected, until the port is unassigned or the deadline, with the port API only."""
+
+        def _release_if_connected() -> bool:
+            if port.get_attribute("connectedTo") != port.api.null:
+                port.set_attributes(commit=True, connectedTo=port.api.null)
+                port.execute("releasePort", [port.ref])
+            return port.get_attribute("state") == "unassigned"
+
+        if not self._wait("port_released", _release_if_connected, max(deadline - time.time(), 0)):
+            raise TgnError(f"Port {port.name} state is {port.get_attribute('state')} after {RELEASE_PORTS_TIMEOUT} seconds")
+
+    def _reserve_ports(self, ports: Dict[str, Tuple["IxnPort", str]]) -> None:
+        """Reserve ports and wait for link up concurrently, all ports must be up within RESERVE_PORTS_TIMEOUT.
+
+        :param ports: {port name: (port, location)}
+        """
+        deadline = time.time() + RESERVE_PORTS_TIMEOUT
+        # Chassis, cards and physical ports objects are created on first access under the bound root (pyixnetwork
+        # IxnPort.reserve reads the global root), so resolve them before spreading out to workers that only connect the
+        # ports and wait for link up, without holding the root lock.
+        tasks = {}
+        with self._bound_root():
+            for name, (port, location) in ports.items():
+                if is_local_host(location):
+                    continue
+                hostname, card, port_id = location.split("/")
+                try:
+                    phy_port = self.ixn.root.hw.get_chassis(hostname).get_card(int(card)).get_port(int(port_id))
+                except KeyError as error:
+                    raise TgnError(f"Physical port {location} unreachable") from error
+                tasks[name] = (port, location, phy_port.ref)
+
+        def _reserve_port(port: "IxnPort", location: str, phy_port_ref: str) -> None:
+            port.set_attributes(commit=True, connectedTo=phy_port_ref)
+            if not self._wait("port_up", lambda: port.get_attribute("state") == "up", deadline - time.time()):
+                state = port.get_attribute("state")
+                raise TgnError(f"Port {location} state is {state} after {RESERVE_PORTS_TIMEOUT} seconds")
+
+        results = run_concurrently(_reserve_port, tasks, RESERVE_PORTS_TIMEOUT)
+        log_task_results(self.logger, "Reserve ports and wait for link up", results)
+        failed = [str(r) for r in results.values() if not r.ok]
+        if failed:
+            raise TgnError(f"Failed to reserve ports - {failed}")
+
+    @measured
     def send_arp(self) -> None:
         """Send ARP/ND for all devices and interfaces."""
+        self._invalidate()
         self.ixn.send_arp_ns()
 
+    @measured
     def start_protocols(self) -> None:
         """Start all protocols."""
+        self._invalidate()
         self.ixn.protocols_start()
 
+    @measured
     def stop_protocols(self) -> None:
         """Stop all protocols."""
+        self._invalidate()
         self.ixn.protocols_stop()
 
-    def start_traffic(self, blocking: str) -> None:
-        """Start traffic on all ports."""
-        self.ixn.regenerate()
-        self.ixn.traffic_apply()
-        self.ixn.l23_traffic_start(is_blocking(blocking))
+    @measured
+    def start_protocols_scoped(self, scope: str, timeout: str) -> Dict[str, dict]:
+        """Start protocols of selected topologies, device groups or ports and wait until all of them are started.
+
+        :param scope: Comma separated list of topologies, device groups or ports names or references, ports select all
+            topologies on the port.
+        :param timeout: Max time (seconds) to wait for all selected objects to start.
+        :return: {object reference: {"name": name, "status": status, "seconds": seconds from start to started}}
+        """
+        return self._protocols_action("start", scope, float(timeout))
+
+    @measured
+    def stop_protocols_scoped(self, scope: str, timeout: str) -> Dict[str, dict]:
+        """Stop protocols of selected topologies, device groups or ports and wait until all of them are stopped.
+
+        :param scope: Comma separated list of topologies, device groups or ports names or references, ports select all
+            topologies on the port.
+        :param timeout: Max time (seconds) to wait for all selected objects to stop.
+        :return: {object reference: {"name": name, "status": status, "seconds": seconds from stop to not started}}
+        """
+        return self._protocols_action("stop", scope, float(timeout))
+
+    def _protocols_action(self, action: str, scope: str, timeout: float) -> Dict[str, dict]:
+        """Run start/stop with one operation per objects type and wait for the status of all objects together."""
+        self._invalidate()
+        objects = self._get_protocols_scope([name.strip() for name in scope.split(",") if name.strip()])
+        objects_by_type: Dict[str, List[str]] = {}
+        for obj_ref in objects:
+            objects_by_type.setdefault(re.sub(r"/[0-9]+", "", obj_ref), []).append(obj_ref)
+        start = time.time()
+        for obj_refs in objects_by_type.values():
+            self.ixn.api.execute(action, obj_refs[0], True, obj_refs)
 
-    def stop_traffic(self) -> None:
-        """Start traffic on all ports."""
-        self.ixn.l23_traffic_stop()
+        summary: Dict[str, dict] = {ref: {"name": name, "status": None, "seconds": None} for ref, name in objects.items()}
+        pending = list(objects)
 
-    def get_statistics(
-        self, context: ResourceCommandContext, view_name: str, output_type: str, table_key: Optional[str]
+        def _poll_status() -> bool:
+            selects = [{"from": obj_ref, "properties": ["status"], "children": [], "inlines": []} for obj_ref in pending]
+            for obj_ref, result in zip(pending, self._select(selects)):
+                summary[obj_ref]["status"] = result["status"]
+                if result["status"] == PROTOCOLS_STATUS[action]:
+                    summary[obj_ref]["seconds"] = round(time.time() - start, 3)
+            pending[:] = [obj_ref for obj_ref in pending if summary[obj_ref]["seconds"] is None]
+            return not pending
+
+        self._wait(f"protocols_{PROTOCOLS_STATUS[action]}", _poll_status, timeout - (time.time() - start))
+
+        for obj_ref, obj_summary in summary.items():
+            self.logger.info(f"{action} {obj_summary['name']} ({obj_ref}) - {obj_summary['status']} {obj_summary['seconds']}s")
+        if pending:
+            statuses = {summary[obj_ref]["name"]: summary[obj_ref]["status"] for obj_ref in pending}
+            raise TgnError(f"Failed to {action} protocols after {timeout} seconds - {statuses}")
+        return summary
+
+    def _get_protocols_scope(self, names: List[str]) -> Dict[str, str]:
+        """Return {object reference: name} of all topologies and device groups selected by name, reference or port name.
+
+        Device groups under selected topologies (or device groups) are started/stopped with their parent, so they are
+        removed from the scope.
+        """
+        children = [
+            {"child": "^vport$", "properties": ["name"], "filters": []},
+            {"child": "^topology$", "properties": ["name", "vports"], "filters": []},
+            {"child": "^deviceGroup$", "properties": ["name"], "filters": []},
+        ]
+        root = self._select(
+            [{"from": f"{self.ixn.api.session}ixnetwork", "properties": [], "children": children, "inlines": []}]
+        )[0]
+        vports = {vport["href"]: vport["name"] for vport in root.get("vport", [])}
+        objects: Dict[str, Tuple[str, List[str]]] = {}
+        nodes = list(root.get("topology", []))
+        while nodes:
+            node = nodes.pop()
+            ports = [vports.get(vport) for vport in node.get("vports", [])]
+            objects[node["href"]] = (node["name"], ports)
+            nodes.extend(node.get("deviceGroup", []))
+
+        scope = {}
+        for name in names:
+            selected = {ref: obj[0] for ref, obj in objects.items() if name in [ref, obj[0], *obj[1]]}
+            if not selected:
+                raise TgnError(f'No topology, device group or port "{name}" in configuration')
+            scope.update(selected)
+        return {ref: name for ref, name in scope.items() if not any(ref.startswith(f"{other}/") for other in scope)}
+
+    @measured
+    def start_traffic(self, context: Optional[ResourceCommandContext], blocking: str, force_regenerate: str) -> None:
+        """Start traffic on all ports.
+
+        Regenerate and apply traffic only if the configuration might have changed since the last apply or the traffic is
+        not applied on the server.
+
+        :param force_regenerate: True - always regenerate and apply traffic, False - only if required.
+        """
+        if self.coordinator:
+            self.coordinator.start_traffic(context, blocking, force_regenerate)
+            return
+        self._prepare_traffic(force_regenerate)
+        self._start_traffic(blocking)
+
+    def _prepare_traffic(self, force_regenerate: str) -> None:
+        """Regenerate and apply traffic if required."""
+        self.object_cache.clear()
+        self._discover_traffic_items()
+        start = time.time()
+        traffic_state = self.ixn.root.get_child_static("traffic").get_attribute("state")
+        if is_true(force_regenerate) or not self.traffic_applied or traffic_state == "unapplied":
+            self.ixn.regenerate()
+            regenerated = time.time()
+            self.ixn.traffic_apply()
+            applied = time.time()
+            self.traffic_applied = True
+            self.statistics_readers = {}
+            self.logger.info(f"Traffic regenerate {regenerated - start:.2f}s, apply {applied - regenerated:.2f}s")
+        else:
+            self.logger.info(f"Traffic is already applied (state {traffic_state}) - skip regenerate and apply")
+
+    def _discover_traffic_items(self) -> None:
+        """Read traffic items objects, if not read yet, bound to the handler session."""
+        with self._bound_root():
+            self.ixn.root.get_child_static("traffic").get_objects_or_children_by_type("trafficItem")
+
+    def _start_traffic(self, blocking: str) -> None:
+        """Start applied traffic, if blocking wait until traffic stops."""
+        start = time.time()
+        traffic = self.ixn.root.get_child_static("traffic")
+        self.ixn.root.api.startStatelessTraffic(traffic, traffic.get_objects_or_children_by_type("trafficItem"))
+        self._wait_traffic_state("traffic_started", TRAFFIC_STATE_TIMEOUT, "started")
+        self.logger.info(f"Traffic start {time.time() - start:.2f}s")
+        if is_blocking(blocking):
+            self._wait_traffic_state("traffic_stopped", TRAFFIC_RUN_TIMEOUT, "stopped")
+        else:
+            time.sleep(TRAFFIC_START_SETTLE_TIME)
+
+    @measured
+    def stop_traffic(self, context: Optional[ResourceCommandContext]) -> None:
+        """Stop traffic on all ports."""
+        if self.coordinator:
+            self.coordinator.stop_traffic(context)
+            return
+        self._stop_traffic()
+
+    def _stop_traffic(self) -> None:
+        """Stop traffic."""
+        self.object_cache.clear()
+        self._discover_traffic_items()
+        traffic = self.ixn.root.get_child_static("traffic")
+        self.ixn.root.api.stopStatelessTraffic(traffic, traffic.get_objects_or_children_by_type("trafficItem"))
+        self._wait_traffic_state("traffic_stopped", TRAFFIC_STATE_TIMEOUT, "stopped", "unapplied")
+
+    def _wait_traffic_state(self, name: str, timeout: float, *states: str) -> None:
+        """Wait until traffic reaches one of the states."""
+        traffic = self.ixn.root.get_child_static("traffic")
+        if not self._wait(name, lambda: traffic.get_attribute("state") in states, timeout):
+            state = traffic.get_attribute("state")
+            raise TgnError(f"Traffic failed to reach {states} state, traffic is {state} after {timeout} seconds")
+
+    @measured
+    def get_statistics(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        context: ResourceCommandContext,
+        view_name: str,
+        output_type: str,
+        table_key: Optional[str],
+        delta: str,
+        columns: Optional[str] = None,
+        key_filter: Optional[str] = None,
+        value_filter: Optional[str] = None,
     ) -> Union[dict, str]:
-        """Get statistics for the requested view."""
-        if view_name == "Port Statistics":
-            stats_obj = IxnPortStatistics()
-        elif view_name == "Traffic Item Statistics":
-            stats_obj = IxnTrafficItemStatistics()
-        elif view_name == "Flow Statistics":
-            stats_obj = IxnFlowStatistics()
+        """Get statistics for the requested view, optionally only the requested columns and rows.
+
+        The IxNetwork view page returns all columns of all rows, so rows and columns are filtered page by page as the view
+        is read and only the requested slice is kept and returned.
+
+        :param delta: True - return only rows that changed since the previous call, with rate columns, False - full view.
+        :param columns: Comma separated list of captions to return, if empty return all columns.
+        :param key_filter: Regular expression, return only rows with matching row key.
+        :param value_filter: Semicolon separated numeric conditions, return only rows that match all conditions
+            (e.g. Loss % > 0; Rx Frames >= 1000).
+        """
+        output_format = output_type.lower().strip()
+        if output_format not in ["json", "csv"]:
+            raise TgnError(f'Output type should be CSV/JSON - got "{output_type}"')
+        if (self.coordinator or is_true(delta)) and not (columns or key_filter or value_filter):
+            captions, statistics = self._read_statistics(context, view_name, table_key, is_true(delta))
+            if output_format == "json":
+                return statistics_to_json(statistics)
+            rows = dict_rows(captions, statistics)
+        else:
+            table = self._read_statistics_table(
+                context, view_name, table_key, is_true(delta), columns, key_filter, value_filter
+            )
+            if output_format == "json":
+                return statistics_to_json(table.to_dict())
+            rows = table.iter_table()
+        output = "".join(iter_csv(rows))
+        attach_stats_csv(context, self.logger, view_name, output)
+        return output
+
+    @measured
+    def get_traffic_verdict(self, view_name: str, thresholds: Dict[str, Optional[str]]) -> dict:
+        """Evaluate traffic thresholds over the statistics view and return verdict with the offending rows only.
+
+        :param thresholds: {threshold name: threshold value}, empty thresholds are not evaluated.
+        """
+        float_thresholds = {name: float(value) for name, value in thresholds.items() if value}
+        check_thresholds(float_thresholds)
+        return self._read_view(view_name, None, lambda reader: traffic_verdict(reader, float_thresholds))
+
+    def _read_statistics(
+        self, context: Optional[ResourceCommandContext], view_name: str, table_key: Optional[str], delta: bool
+    ) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+        """Read the full statistics view, or only rows that changed since the previous call - (captions, statistics).
+
+        In coordinator mode read the view from all coordinated controllers.
+        """
+        if self.coordinator:
+            return self.coordinator.read_statistics(context, view_name, table_key, delta)
+        return self._read_controller_statistics(view_name, table_key, delta)
+
+    def _read_statistics_table(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        context: Optional[ResourceCommandContext],
+        view_name: str,
+        table_key: Optional[str],
+        delta: bool,
+        columns: Optional[str],
+        key_filter: Optional[str],
+        value_filter: Optional[str],
+    ) -> IxnStatisticsTable:
+        """Read the statistics view, or only rows that changed since the previous call, into table.
+
+        :param columns: Comma separated list of captions to keep, if empty keep all columns.
+        :param key_filter: Regular expression, keep only rows with matching row key.
+        :param value_filter: Semicolon separated numeric conditions, keep only rows that match all conditions.
+        """
+        projection = [caption.strip() for caption in columns.split(",") if caption.strip()] if columns else []
+        conditions = parse_conditions(value_filter) if value_filter else []
+        conditions_columns = [caption for caption, _ in conditions if caption not in projection] if projection else []
+        if self.coordinator or delta:
+            captions, statistics = self._read_statistics(context, view_name, table_key, delta)
+            table = IxnStatisticsTable.from_rows(
+                ((key, [row.get(caption, "") for caption in captions]) for key, row in statistics.items()),
+                captions,
+                projection + conditions_columns,
+                key_filter,
+            )
         else:
-            stats_obj = IxnStatisticsView(view_name, table_key)
-
-        stats_obj.read_stats()
-        statistics = stats_obj.get_all_stats()
-        if output_type.lower().strip() == "json":
-            statistics_str = json.dumps(statistics, indent=4, sort_keys=True, ensure_ascii=False)
-            return json.loads(statistics_str)
-        if output_type.lower().strip() == "csv":
-            output = io.StringIO()
-            csv_writer = csv.DictWriter(output, stats_obj.captions)
-            csv_writer.writeheader()
-            for obj_name in statistics:
-                csv_writer.writerow(statistics[obj_name])
-            attach_stats_csv(context, self.logger, view_name, output.getvalue().strip())
-            return output.getvalue().strip()
-        raise TgnError(f'Output type should be CSV/JSON - got "{output_type}"')
+            table = self._read_view(
+                view_name,
+                table_key,
+                lambda reader: IxnStatisticsTable.read(reader, projection + conditions_columns, key_filter),
+            )
+        return select_statistics(table, projection, conditions)
 
+    def _read_controller_statistics(
+        self, view_name: str, table_key: Optional[str], delta: bool
+    ) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+        """Read the full statistics view of this controller, or only rows that changed - (captions, statistics)."""
+
+        def read(reader: IxnStatisticsReader) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+            statistics = reader.read_delta() if delta else reader.read()
+            return reader.delta_captions if delta else reader.captions, statistics
+
+        return self._read_view(view_name, table_key, read)
+
+    def _read_view(self, view_name: str, table_key: Optional[str], read: Callable[[IxnStatisticsReader], T]) -> T:
+        """Read the statistics view with the cached reader, if the read fails re-resolve the view and read once more.
+
+        IxNetwork may remove and re-create views (e.g. on traffic apply) so the cached view object can become stale.
+        Invalid queries (StatisticsQueryError) are never retried.
+        """
+        reader = self._get_statistics_reader(view_name, table_key)
+        try:
+            return read(reader)
+        except StatisticsQueryError:
+            raise
+        except TgnError as error:
+            self.logger.warning(f"Failed to read statistics view {view_name} ({error}) - re-resolve view and retry")
+            self.statistics_readers.pop((view_name, table_key), None)
+            return read(self._get_statistics_reader(view_name, table_key))
+
+    def _get_statistics_reader(self, view_name: str, table_key: Optional[str]) -> IxnStatisticsReader:
+        """Return cached statistics reader for the view, create new reader (TgnError if view not found) on first request."""
+        reader = self.statistics_readers.get((view_name, table_key))
+        if not reader:
+            with self._bound_root():
+                reader = IxnStatisticsReader(view_name, table_key)
+            self.statistics_readers[(view_name, table_key)] = reader
+        return reader
+
+    @measured
+    def start_stats_recording(self, view_names: str, interval: str) -> None:
+        """Start recording statistics views in the background.
+
+        :param view_names: Comma separated list of view names, for user defined views add the table key after colon.
+        :param interval: Sampling interval in seconds.
+        """
+        if self.statistics_recorder and self.statistics_recorder.is_recording:
+            raise TgnError(f"Statistics recording of {list(self.statistics_recorder.files)} is already running")
+        views = [(name, key or None) for name, _, key in (view.strip().partition(":") for view in view_names.split(","))]
+        for view_name, table_key in views:
+            self._get_statistics_reader(view_name, table_key)
+        self.statistics_recorder = IxnStatisticsRecorder(views, self._read_view, float(interval), self.logger)
+        self.statistics_recorder.start()
+
+    @measured
+    def stop_stats_recording(self, context: ResourceCommandContext) -> List[str]:
+        """Stop statistics recording and attach the recorded files to the reservation."""
+        if not self.statistics_recorder:
+            raise TgnError("Statistics recording is not running")
+        recorder, self.statistics_recorder = self.statistics_recorder, None
+        recorder.stop()
+        file_names = []
+        for view_name, file in recorder.files.items():
+            file_names.append(
+                attach_stats_csv(context, self.logger, f"{view_name} Recording", file.read_bytes(), suffix="csv.gz")
+            )
+        recorder.remove_files()
+        return file_names
+
+    @measured
     def run_quick_test(self, context: ResourceCommandContext, test: str) -> None:
         """Run quick test."""
-        self.ixn.quick_test_apply(test)
-        self.ixn.quick_test_start(test, blocking=True, timeout=3600 * 24)
-        output = io.BytesIO()
-        self.ixn.root.quick_tests[test].get_report(output)
-        attach_stats_csv(context, self.logger, "quick_test", output.getvalue().strip(), suffix="pdf")
+        self.quick_tests.run(context, test)
+
+    @measured
+    def run_quick_tests(self, context: ResourceCommandContext, tests: str) -> str:
+        """Run multiple quick tests one after the other and attach their reports and a summary CSV."""
+        return self.quick_tests.run_batch(context, tests)
+
+    @measured
+    def start_quick_test(self, test: str) -> None:
+        """Apply and start quick test and return immediately."""
+        self.quick_tests.start(test)
+
+    @measured
+    def get_quick_test_status(self, test: str) -> dict:
+        """Get quick test running status and progress."""
+        return self.quick_tests.get_status(test)
+
+    @measured
+    def collect_quick_test_results(self, context: ResourceCommandContext, test: str) -> str:
+        """Attach quick test report to the reservation, quick test must not be running."""
+        return self.quick_tests.collect_results(context, test)
 
+    @measured
     def get_session_id(self) -> str:
         """Get REST session ID."""
         return self.ixn.api.session
 
+    @measured
     def get_children(self, obj_ref: str, child_type: str) -> list:
         """Get object attributes."""
-        return self.ixn.api.getList(obj_ref, child_type)
+        return self.object_cache.get(("children", obj_ref, child_type), lambda: self.ixn.api.getList(obj_ref, child_type))
 
+    @measured
     def get_attributes(self, obj_ref: str) -> dict:
         """Get object attributes."""
-        return self.ixn.api.getAttributes(obj_ref)
+        return self.object_cache.get(("attributes", obj_ref), lambda: self.ixn.api.getAttributes(obj_ref))
 
+    @measured
     def set_attribute(self, obj_ref: str, attr_name: str, attr_value: str) -> None:
         """Set traffic generator object attribute."""
+        self._invalidate(config_changed=True)
         self.ixn.api.setAttributes(obj_ref, **{attr_name: attr_value})
+
+    @measured
+    def set_object_cache(self, ttl: str, max_entries: str) -> None:
+        """Configure get_children/get_attributes read-through cache.
+
+        :param ttl: Time to live of cache entries in seconds, 0 disables the cache.
+        :param max_entries: Max number of cached entries.
+        """
+        self.object_cache.clear()
+        self.object_cache.ttl = float(ttl)
+        self.object_cache.max_entries = int(max_entries)
+
+    @measured
+    def get_object_cache_statistics(self) -> Dict[str, float]:
+        """Get get_children/get_attributes read-through cache settings and hit/miss counters."""
+        return self.object_cache.get_statistics()
+
+    @measured
+    def get_attributes_bulk(self, obj_refs: str) -> Dict[str, dict]:
+        """Get attributes of multiple objects with a single REST request.
+
+        :param obj_refs: JSON list of object references or [object reference, [attribute names]] pairs.
+        :return: {object reference: {attribute name: attribute value}}
+        """
+        requests_list: List[list] = [[r, ["*"]] if isinstance(r, str) else r for r in json.loads(obj_refs)]
+        selects = [{"from": obj_ref, "properties": attrs, "children": [], "inlines": []} for obj_ref, attrs in requests_list]
+        return {obj_ref: result for (obj_ref, _), result in zip(requests_list, self._select(selects))}
+
+    @measured
+    def set_attributes_bulk(self, attributes: str) -> None:
+        """Set attributes of multiple objects with a single REST request per object.
+
+        :param attributes: JSON list of [object reference, {attribute name: attribute value}] pairs.
+        """
+        self._invalidate(config_changed=True)
+        objects_attributes: Dict[str, dict] = {}
+        for obj_ref, obj_attributes in json.loads(attributes):
+            objects_attributes.setdefault(obj_ref, {}).update(obj_attributes)
+        results = run_concurrently(
+            lambda obj_ref, attrs: self.ixn.api.setAttributes(obj_ref, **attrs),
+            {obj_ref: (obj_ref, attrs) for obj_ref, attrs in objects_attributes.items()},
+            SET_ATTRIBUTES_TIMEOUT,
+        )
+        failed = [str(r) for r in results.values() if not r.ok]
+        if failed:
+            raise TgnError(f"Failed to set attributes - {failed}")
+
+    @measured
+    def get_subtree(self, obj_ref: str, depth: str, child_types: Optional[str]) -> dict:
+        """Get object attributes and all descendants attributes with a single REST request.
+
+        :param depth: Max depth of descendants to return, 0 for object attributes only.
+        :param child_types: Comma separated list of descendants types to return, if empty return all types.
+        """
+        child_regex = f"^({'|'.join(t.strip() for t in child_types.split(','))})$" if child_types else ".*"
+        children = [] if int(depth) == 0 else [{"child": child_regex, "properties": ["*"], "filters": []}]
+        select = {"from": obj_ref, "properties": ["*"], "children": children, "inlines": []}
+        return prune_subtree(self._select([select])[0], int(depth))
+
+    def get_performance_metrics(self, prometheus_file: Optional[str]) -> Dict[str, dict]:
+        """Get commands latencies and REST requests counters and optionally write them in Prometheus text format.
+
+        :param prometheus_file: Full path of Prometheus text file to write (e.g. node exporter textfile collector).
+        """
+        if prometheus_file:
+            self.metrics.write_prometheus(Path(prometheus_file))
+        return self.metrics.to_dict()
+
+    def _select(self, selects: List[dict]) -> List[dict]:
+        """Run IxNetwork select operation - read multiple objects and sub-trees with one REST request."""
+        response = self.ixn.api.request(
+            requests.post, f"{self.ixn.api.root_url}ixnetwork/operations/select", data={"selects": selects}
+        )
+        if response.json().get("state", "success").lower() != "success":
+            response = self.ixn.api.wait_for_complete(response)
+        return response.json()["result"]
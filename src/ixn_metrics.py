@@ -0,0 +1,214 @@
+"""
+IxNetwork controller shell commands performance metrics.
+"""
+import functools
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+SAMPLES_PER_COMMAND = 1024
+QUANTILES = [0.5, 0.9, 0.99]
+
+Func = TypeVar("Func", bound=Callable[..., object])
+
+
+class CommandMetrics:  # pylint: disable=too-many-instance-attributes
+    """Latency, REST requests and polls counters of a single command."""
+
+    def __init__(self) -> None:
+        """Init counters."""
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rest_requests = 0
+        self.rest_time = 0.0
+        self.phases: Dict[str, float] = {}
+        self.polls: Dict[str, int] = {}
+        self.samples: Deque[float] = deque(maxlen=SAMPLES_PER_COMMAND)
+
+    def quantile(self, quantile: float) -> float:
+        """Return nearest rank latency quantile over the last SAMPLES_PER_COMMAND samples."""
+        if not self.samples:
+            return 0.0
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(quantile * len(samples)))]
+
+    def to_dict(self) -> dict:
+        """Return counters as JSON serializable dictionary."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total": round(self.total, 6),
+            "max": round(self.max, 6),
+            **{f"p{int(q * 100)}": round(self.quantile(q), 6) for q in QUANTILES},
+            "rest_requests": self.rest_requests,
+            "rest_time": round(self.rest_time, 6),
+            "phases": {phase: round(duration, 6) for phase, duration in self.phases.items()},
+            "polls": dict(self.polls),
+        }
+
+
+class PerformanceMetrics:
+    """Collect commands latencies and attribute REST requests and phases to the running command.
+
+    The running command is kept in a context variable, so REST requests and phases are attributed to the command running
+    in the current context. run_concurrently workers run in a copy of the caller context, so their requests are
+    attributed to the command that started them. Requests of other threads (e.g. statistics recorder or sessions pool
+    sweeper) are not attributed to any command.
+    """
+
+    def __init__(self) -> None:
+        """Init empty metrics."""
+        self.commands: Dict[str, CommandMetrics] = {}
+        self.active: Optional[str] = None
+        self.lock = threading.Lock()
+        self._command: ContextVar[Optional[str]] = ContextVar(f"ixn_command_{id(self)}", default=None)
+
+    @contextmanager
+    def measure(self, command: str) -> Iterator[None]:
+        """Measure command latency, nested commands are counted as part of the outermost command.
+
+        active is the last started command that is still running, for diagnostics only.
+        """
+        if self._command.get():
+            yield
+            return
+        token = self._command.set(command)
+        previous, self.active = self.active, command
+        start = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            duration = time.perf_counter() - start
+            with self.lock:
+                metrics = self.commands.setdefault(command, CommandMetrics())
+                metrics.count += 1
+                metrics.errors += failed
+                metrics.total += duration
+                metrics.max = max(metrics.max, duration)
+                metrics.samples.append(duration)
+                if self.active == command:
+                    self.active = previous
+            self._command.reset(token)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add command phase duration, e.g. CloudShell API or chassis operations, to the running command."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(time.perf_counter() - start, name)
+
+    def wrap_rest(self, request: Func) -> Func:
+        """Wrap IxNetwork REST API request method to count requests and time of the running command."""
+        request = getattr(request, "__wrapped__", request)
+
+        @functools.wraps(request)
+        def _request(*args: object, **kwargs: object) -> object:
+            start = time.perf_counter()
+            try:
+                return request(*args, **kwargs)
+            finally:
+                self._add(time.perf_counter() - start)
+
+        return _request  # type: ignore[return-value]
+
+    def add_polls(self, wait: str, polls: int) -> None:
+        """Add the number of polls of a wait loop (e.g. traffic_stopped) to the running command."""
+        command = self._command.get()
+        if not command:
+            return
+        with self.lock:
+            metrics = self.commands.setdefault(command, CommandMetrics())
+            metrics.polls[wait] = metrics.polls.get(wait, 0) + polls
+
+    def _add(self, duration: float, phase: Optional[str] = None) -> None:
+        """Add REST request (phase is None) or phase duration to the running command, ignore if no command is running."""
+        command = self._command.get()
+        if not command:
+            return
+        with self.lock:
+            metrics = self.commands.setdefault(command, CommandMetrics())
+            if phase:
+                metrics.phases[phase] = metrics.phases.get(phase, 0.0) + duration
+            else:
+                metrics.rest_requests += 1
+                metrics.rest_time += duration
+
+    def to_dict(self) -> Dict[str, dict]:
+        """Return all commands metrics as JSON serializable dictionary."""
+        with self.lock:
+            return {command: metrics.to_dict() for command, metrics in sorted(self.commands.items())}
+
+    def to_prometheus(self) -> str:
+        """Return all commands metrics in Prometheus text exposition format."""
+        lines: List[str] = [
+            "# HELP ixn_command_duration_seconds IxNetwork controller shell command latency.",
+            "# TYPE ixn_command_duration_seconds summary",
+        ]
+        metrics = self.to_dict()
+        for command, values in metrics.items():
+            for quantile in QUANTILES:
+                value = values[f"p{int(quantile * 100)}"]
+                lines.append(f'ixn_command_duration_seconds{{command="{command}",quantile="{quantile}"}} {value}')
+            lines.append(f'ixn_command_duration_seconds_sum{{command="{command}"}} {values["total"]}')
+            lines.append(f'ixn_command_duration_seconds_count{{command="{command}"}} {values["count"]}')
+        for name, key, help_text in [
+            ("ixn_command_errors_total", "errors", "Number of failed commands."),
+            ("ixn_command_rest_requests_total", "rest_requests", "Number of IxNetwork REST requests sent by commands."),
+            ("ixn_command_rest_seconds_total", "rest_time", "Time spent in IxNetwork REST requests by commands."),
+        ]:
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} counter"])
+            lines.extend(f'{name}{{command="{command}"}} {values[key]}' for command, values in metrics.items())
+        lines.extend(
+            [
+                "# HELP ixn_command_phase_seconds_total Time spent in command phases.",
+                "# TYPE ixn_command_phase_seconds_total counter",
+            ]
+        )
+        for command, values in metrics.items():
+            lines.extend(
+                f'ixn_command_phase_seconds_total{{command="{command}",phase="{phase}"}} {duration}'
+                for phase, duration in values["phases"].items()
+            )
+        lines.extend(
+            [
+                "# HELP ixn_command_polls_total Number of IxNetwork state polls by command wait loops.",
+                "# TYPE ixn_command_polls_total counter",
+            ]
+        )
+        for command, values in metrics.items():
+            lines.extend(
+                f'ixn_command_polls_total{{command="{command}",wait="{wait}"}} {polls}'
+                for wait, polls in values["polls"].items()
+            )
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, file_name: Path) -> None:
+        """Atomically write metrics in Prometheus text format, for node exporter textfile collector."""
+        file_name = Path(file_name)
+        fd, temp_name = tempfile.mkstemp(dir=file_name.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_name, file_name)
+
+
+def measured(func: Func) -> Func:
+    """Measure IxnHandler command with the handler performance metrics."""
+
+    @functools.wraps(func)
+    def _measured(self: object, *args: object, **kwargs: object) -> object:
+        with self.metrics.measure(func.__name__):  # type: ignore[attr-defined]
+            return func(self, *args, **kwargs)
+
+    return _measured  # type: ignore[return-value]
@@ -0,0 +1,116 @@
+"""
+Adaptive polling of IxNetwork API server states shared by all driver instances in the driver host process.
+"""
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+POLL_MIN_INTERVAL = 0.5
+POLL_MAX_INTERVAL = 8.0
+POLL_BACKOFF = 2.0
+POLL_JITTER = 0.2
+MAX_IN_FLIGHT_POLLS = 4
+
+
+class PollScheduler:  # pylint: disable=too-many-instance-attributes
+    """Wait for API server states with exponential backoff and jitter, and cap the number of in-flight polls.
+
+    Each wait polls first immediately, then after min_interval and backs off up to max_interval. Every delay is
+    randomized by +/- jitter so waits that started together (e.g. coordinated controllers or sandboxes started by the
+    same blueprint) spread out instead of polling the server in lockstep. If the expected wait duration is known, the
+    delay is cut so one poll lands at the expected completion time and the backoff restarts from min_interval there.
+
+    All waits on the same API server share max_in_flight slots, a poll waits for a free slot before sending its
+    requests. Slots are reentrant per thread - a wait nested in a poll (e.g. a poll that runs a non-blocking REST
+    operation and waits for its completion) polls with the slot its thread already holds, so nested waits never block
+    each other.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        max_in_flight: int = MAX_IN_FLIGHT_POLLS,
+        min_interval: float = POLL_MIN_INTERVAL,
+        max_interval: float = POLL_MAX_INTERVAL,
+        backoff: float = POLL_BACKOFF,
+        jitter: float = POLL_JITTER,
+    ) -> None:
+        """Create scheduler.
+
+        :param max_in_flight: Max number of concurrent polls.
+        :param min_interval: First delay (seconds) between polls.
+        :param max_interval: Max delay (seconds) between polls.
+        :param backoff: Delay multiplier after each unsuccessful poll.
+        :param jitter: Max random deviation of each delay, as fraction of the delay.
+        """
+        self.max_in_flight = max_in_flight
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.polls: Counter = Counter()
+        self.waits: Counter = Counter()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def wait(self, name: str, poll: Callable[[], bool], timeout: float, expected: Optional[float] = None) -> int:
+        """Call poll until it returns True or the timeout expires, poll is always called once more at the deadline.
+
+        :param name: Wait name for the poll counters, e.g. traffic_stopped.
+        :param poll: Returns True when the wait is complete.
+        :param timeout: Max wait time in seconds.
+        :param expected: Expected wait duration in seconds, if known.
+        :return: Number of polls if the wait completed, negative number of polls if the timeout expired.
+        """
+        start = time.time()
+        deadline = start + timeout
+        interval = self.min_interval
+        polls = 0
+        while True:
+            done = self._poll(poll)
+            polls += 1
+            now = time.time()
+            if done or now >= deadline:
+                break
+            delay = interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            interval = min(interval * self.backoff, self.max_interval)
+            if expected is not None and now < start + expected <= now + delay:
+                delay, interval = start + expected - now, self.min_interval
+            time.sleep(min(delay, deadline - now))
+        with self._lock:
+            self.polls[name] += polls
+            self.waits[name] += 1
+        return polls if done else -polls
+
+    def _poll(self, poll: Callable[[], bool]) -> bool:
+        """Call poll holding a slot, if the current thread already holds a slot (nested wait) call poll with it."""
+        if getattr(self._local, "holds_slot", False):
+            return poll()
+        with self._slots:
+            self._local.holds_slot = True
+            try:
+                return poll()
+            finally:
+                self._local.holds_slot = False
+
+    def get_statistics(self) -> Dict[str, object]:
+        """Return scheduler settings and polls/waits counters by wait name."""
+        with self._lock:
+            return {"max_in_flight": self.max_in_flight, "polls": dict(self.polls), "waits": dict(self.waits)}
+
+
+poll_schedulers: Dict[str, PollScheduler] = {}
+poll_schedulers_lock = threading.Lock()
+
+
+def get_poll_scheduler(api_server: str) -> PollScheduler:
+    """Return the poll scheduler of the API server, create it on first request.
+
+    :param api_server: API server URL.
+    """
+    with poll_schedulers_lock:
+        if api_server not in poll_schedulers:
+            poll_schedulers[api_server] = PollScheduler()
+        return poll_schedulers[api_server]
@@ -0,0 +1,156 @@
+"""
+IxNetwork controller quick tests - run quick tests, poll their status and attach their results and reports.
+"""
+# pylint: disable=protected-access
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from os import path
+from typing import TYPE_CHECKING, Dict, List, Set
+
+import requests
+from cloudshell.shell.core.driver_context import ResourceCommandContext
+from cloudshell.traffic.tg import attach_stats_csv
+from trafficgenerator.tgn_utils import TgnError, is_true
+
+from ixn_statistics import iter_csv
+
+if TYPE_CHECKING:
+    from ixnetwork.ixn_root import IxnQuickTest
+
+    from ixn_handler import IxnHandler
+
+QUICK_TEST_TIMEOUT = 3600 * 24
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+QUICK_TEST_STATUS_ATTRIBUTES = ["isRunning", "status", "progress", "result", "duration"]
+# Results attributes that are not test results - running state and REST object meta-data.
+RESULTS_META_ATTRIBUTES = ["isRunning", "id", "links"]
+
+
+class IxnQuickTests:
+    """Run the quick tests of the handler session.
+
+    Quick test apply builds the test traffic on the API server, so a quick test is applied only if it was not applied
+    since the last configuration change (load config, set attribute(s), cleanup).
+    """
+
+    def __init__(self, handler: "IxnHandler") -> None:
+        """Create quick tests runner, no quick test is applied yet.
+
+        :param handler: Handler of the session that holds the quick tests.
+        """
+        self.handler = handler
+        self.applied: Set[str] = set()
+
+    def run(self, context: ResourceCommandContext, test: str) -> None:
+        """Run quick test and attach its report."""
+        quick_test = self._get_quick_tests([test])[test]
+        self._run(test, quick_test)
+        self._attach_report(context, quick_test, "quick_test")
+
+    def run_batch(self, context: ResourceCommandContext, tests: str) -> str:
+        """Run multiple quick tests one after the other and attach their reports and a summary CSV.
+
+        The report of each test is downloaded and attached in the background while the next test runs. The summary holds
+        one row per test with the test results attributes and the attached report name.
+
+        :param tests: Comma separated list of quick test names.
+        """
+        names = [test.strip() for test in tests.split(",") if test.strip()]
+        quick_tests = self._get_quick_tests(names)
+        with ThreadPoolExecutor(max_workers=1) as downloader:
+            runs = []
+            for name in names:
+                self.handler.logger.info(f"Run quick test {name}")
+                results = self._run(name, quick_tests[name])
+                report = downloader.submit(copy_context().run, self._attach_report, context, quick_tests[name], name)
+                runs.append((name, results, report))
+            summary = [{"Test": name, **results, "Report": report.result()} for name, results, report in runs]
+        captions = ["Test"] + list(dict.fromkeys(c for _, results, _ in runs for c in results)) + ["Report"]
+        output = "".join(iter_csv([captions] + [[str(row.get(caption, "")) for caption in captions] for row in summary]))
+        attach_stats_csv(context, self.handler.logger, "quick_tests_summary", output)
+        return output
+
+    def start(self, test: str) -> None:
+        """Apply (if needed) and start quick test and return immediately."""
+        quick_test = self._get_quick_tests([test])[test]
+        self._apply(test, quick_test)
+        quick_test.start(blocking=False)
+
+    def get_status(self, test: str) -> dict:
+        """Get quick test running status and progress.
+
+        Progress percent and current iteration are parsed from the progress message when available.
+        """
+        results = self._get_quick_tests([test])[test].get_child_static("results")
+        attributes = self.handler.ixn.api.getAttributes(results.ref)
+        status = {attribute: attributes.get(attribute) for attribute in QUICK_TEST_STATUS_ATTRIBUTES}
+        iteration = re.search(r"Iteration\s*(\d+)\s*/\s*(\d+)", str(status["progress"]))
+        if iteration:
+            status["iteration"], status["iterations"] = int(iteration.group(1)), int(iteration.group(2))
+            status["percent"] = round(100 * (status["iteration"] - 1) / status["iterations"])
+        return status
+
+    def collect_results(self, context: ResourceCommandContext, test: str) -> str:
+        """Attach quick test report to the reservation, quick test must not be running."""
+        quick_test = self._get_quick_tests([test])[test]
+        if is_true(quick_test.get_child_static("results").get_attribute("isRunning")):
+            raise TgnError(f"Quick test {test} is still running")
+        return self._attach_report(context, quick_test, test)
+
+    def _get_quick_tests(self, names: List[str]) -> Dict[str, "IxnQuickTest"]:
+        """Return {name: quick test} of all quick tests in the configuration, raise if any of the names is missing."""
+        with self.handler._bound_root():
+            quick_tests = self.handler.ixn.root.quick_tests
+        missing_tests = [name for name in names if name not in quick_tests]
+        if missing_tests:
+            raise TgnError(f"Quick tests {missing_tests} not found in configuration - {list(quick_tests)}")
+        return quick_tests
+
+    def _apply(self, test: str, quick_test: "IxnQuickTest") -> None:
+        """Apply quick test unless it was already applied since the last configuration change."""
+        self.handler._invalidate(config_changed=True, quick_tests_changed=False)
+        if test not in self.applied:
+            quick_test.apply()
+            self.applied.add(test)
+
+    def _run(self, test: str, quick_test: "IxnQuickTest") -> Dict[str, object]:
+        """Apply (if needed) and start quick test, wait until the test is not running and return its results attributes."""
+        self._apply(test, quick_test)
+        quick_test.start(blocking=False)
+        results = quick_test.get_child_static("results")
+        finished = self.handler._wait(
+            "quick_test_finished",
+            lambda: not is_true(results.get_attribute("isRunning")),
+            QUICK_TEST_TIMEOUT,
+            f"quick_test/{test}",
+        )
+        if not finished:
+            raise TgnError(f"Quick test {test} is still running after {QUICK_TEST_TIMEOUT} seconds")
+        attributes = self.handler.ixn.api.getAttributes(results.ref)
+        return {
+            name: value
+            for name, value in attributes.items()
+            if name not in RESULTS_META_ATTRIBUTES and not isinstance(value, (list, dict))
+        }
+
+    def _attach_report(self, context: ResourceCommandContext, quick_test: "IxnQuickTest", name: str) -> str:
+        """Generate quick test report and stream it from the API server to reservation attachment."""
+        api = self.handler.ixn.api
+        report_path = quick_test.execute("generateReport", quick_test.ref)
+        download_params = {"filename": path.basename(report_path)}
+        if path.dirname(report_path):
+            download_params["absolute"] = path.dirname(report_path)
+        response = api.request(
+            requests.get,
+            f"{api.root_url}ixnetwork/files",
+            headers={"content-type": "application/octet-stream"},
+            params=download_params,
+            stream=True,
+        )
+        with tempfile.TemporaryFile() as report:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                report.write(chunk)
+            report.seek(0)
+            return attach_stats_csv(context, self.handler.logger, name, report, suffix="pdf")
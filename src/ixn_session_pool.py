@@ -0,0 +1,114 @@
+"""
+Pool of idle IxNetwork REST sessions shared by all driver instances in the driver host process.
+"""
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from ixn_utils import ROOT_LOCK, UploadCache
+
+if TYPE_CHECKING:
+    from ixnetwork.ixn_app import IxnApp
+
+SessionKey = Tuple[str, int, Optional[str]]
+
+# Configuration files uploaded to each session (by session URL), sessions outlive handlers in the sessions pool.
+config_uploads: Dict[str, UploadCache] = {}
+
+
+class IxnSessionPool:
+    """Keep idle connected IxnApp objects, keyed by (API server, API port, user), for reuse by new driver instances.
+
+    Connecting to Linux API server creates and licenses a new session which takes tens of seconds, reusing an idle
+    session saves this time. Sessions are cleared (new config) when returned to the pool and disconnected after their
+    time to live expires, by a background sweeper that runs as long as the pool is not empty.
+    """
+
+    def __init__(self) -> None:
+        """Create empty pool."""
+        self.sessions: Dict[SessionKey, List[Tuple[float, "IxnApp"]]] = {}
+        self.lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def acquire(self, key: SessionKey, logger: logging.Logger) -> Optional["IxnApp"]:
+        """Return idle live session for key, or None if there is no such session.
+
+        :param key: (API server, API port, user).
+        :param logger: logger of the new session owner.
+        """
+        from ixnetwork.ixn_object import IxnObject  # pylint: disable=import-outside-toplevel
+
+        self.evict_expired()
+        while True:
+            with self.lock:
+                if not self.sessions.get(key):
+                    return None
+                _, ixn = self.sessions[key].pop()
+            try:
+                ixn.api.getVersion()
+            except Exception as error:  # pylint: disable=broad-except
+                logger.debug(f"Drop dead pooled session {ixn.api.session} - {error}")
+                continue
+            ixn.logger = ixn.api.logger = ixn.root.logger = logger
+            with ROOT_LOCK:
+                IxnObject.root = ixn.root
+            logger.info(f"Reuse pooled session {ixn.api.session} on {key}")
+            return ixn
+
+    def release(self, key: SessionKey, ixn: "IxnApp", ttl: float) -> None:
+        """Clear session configuration and return the session to the pool.
+
+        :param key: (API server, API port, user).
+        :param ixn: connected session.
+        :param ttl: how long (seconds) to keep the idle session in the pool.
+        """
+        try:
+            ixn.new_config()
+        except Exception as error:  # pylint: disable=broad-except
+            ixn.logger.warning(f"Failed to clear session {ixn.api.session}, session will not be reused - {error}")
+            _disconnect(ixn)
+            return
+        with self.lock:
+            self.sessions.setdefault(key, []).append((time.time() + ttl, ixn))
+            self._wakeup.set()
+            if not self._sweeper:
+                self._sweeper = threading.Thread(target=self._sweep, name="ixn-session-pool-sweeper", daemon=True)
+                self._sweeper.start()
+        ixn.logger.info(f"Session {ixn.api.session} returned to pool for {ttl} seconds")
+
+    def evict_expired(self) -> None:
+        """Disconnect all sessions with expired time to live."""
+        now = time.time()
+        expired: List["IxnApp"] = []
+        with self.lock:
+            for key, sessions in self.sessions.items():
+                expired.extend(ixn for expiration, ixn in sessions if expiration <= now)
+                self.sessions[key] = [(expiration, ixn) for expiration, ixn in sessions if expiration > now]
+        for ixn in expired:
+            _disconnect(ixn)
+
+    def _sweep(self) -> None:
+        """Evict each session when its time to live expires, exit when the pool is empty."""
+        while True:
+            with self.lock:
+                expirations = [expiration for sessions in self.sessions.values() for expiration, _ in sessions]
+                if not expirations:
+                    self._sweeper = None
+                    return
+                self._wakeup.clear()
+            self._wakeup.wait(max(min(expirations) - time.time(), 0))
+            self.evict_expired()
+
+
+def _disconnect(ixn: "IxnApp") -> None:
+    """Disconnect session ignoring errors - session might be already closed by the server."""
+    config_uploads.pop(ixn.api.root_url, None)
+    try:
+        ixn.disconnect()
+    except Exception as error:  # pylint: disable=broad-except
+        ixn.logger.debug(f"Failed to disconnect session {ixn.api.session} - {error}")
+
+
+session_pool = IxnSessionPool()
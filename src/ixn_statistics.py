@@ -0,0 +1,584 @@
+"""
+IxNetwork controller statistics readers.
+"""
+import csv
+import functools
+import gzip
+import io
+import logging
+import math
+import operator
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from trafficgenerator.tgn_utils import TgnError, is_false
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # pylint: disable=invalid-name
+
+if TYPE_CHECKING:
+    from ixnetwork.ixn_statistics_view import IxnStatisticsView
+
+STATISTICS_PAGE_SIZE = 500
+CSV_CHUNK_ROWS = 1000
+NUMBER_REGEX = re.compile(r"-?[0-9]+(?:\.([0-9]+))?")
+CONDITION_REGEX = re.compile(r"(.+?)\s*(<=|>=|==|!=|<|>)\s*(\S+)")
+CONDITION_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+VIEW_2_CLASS = {
+    "Port Statistics": "IxnPortStatistics",
+    "Traffic Item Statistics": "IxnTrafficItemStatistics",
+    "Flow Statistics": "IxnFlowStatistics",
+}
+
+# Traffic verdict threshold name: (column caption or caption suffix, True - max allowed value, False - min allowed value).
+VERDICT_THRESHOLDS = {
+    "loss": ("Loss %", True),
+    "min_latency": ("Min Latency (ns)", True),
+    "avg_latency": ("Avg Latency (ns)", True),
+    "max_latency": ("Max Latency (ns)", True),
+    "rx_rate": ("Rx Frame Rate", False),
+}
+
+
+class StatisticsQueryError(TgnError):
+    """Invalid statistics query (unknown column or threshold, invalid condition) - reading the view again cannot help."""
+
+
+# pylint: disable=too-many-instance-attributes
+class IxnStatisticsReader:
+    """Persistent statistics view reader.
+
+    The view object is resolved once (resolving a view by caption costs one REST call per view on the server) and the
+    view pages are read one by one. The reader also keeps the last snapshot so consecutive reads can return only rows
+    that changed since the last poll, with per second rates of all numeric columns.
+    """
+
+    def __init__(self, view_name: str, table_key: Optional[str] = None, page_size: int = STATISTICS_PAGE_SIZE) -> None:
+        """Get the requested statistics view object from IXN.
+
+        Views that IxNetwork creates only on traffic apply (e.g. Flow Statistics) do not exist before the first apply.
+
+        :param view_name: Statistics view name.
+        :param table_key: The name of the key column, required only for views other than the pre-defined views.
+        :param page_size: Number of rows to read with each REST call.
+        """
+        from ixnetwork import ixn_statistics_view  # pylint: disable=import-outside-toplevel
+
+        if view_name in VIEW_2_CLASS:
+            self.view: "IxnStatisticsView" = getattr(ixn_statistics_view, VIEW_2_CLASS[view_name])()
+        else:
+            self.view = ixn_statistics_view.IxnStatisticsView(view_name, table_key)
+        if not hasattr(self.view, "ixn_view"):
+            raise TgnError(f'Statistics view "{view_name}" not found, is traffic applied?')
+        self.flow_view = isinstance(self.view, ixn_statistics_view.IxnFlowStatistics)
+        self.page_size = page_size
+        self.captions: List[str] = []
+        self.snapshot: Dict[str, List[str]] = {}
+        self.snapshot_time = 0.0
+        self.rate_captions: List[str] = []
+        self.lock = threading.Lock()
+
+    def __str__(self) -> str:
+        """Return IxNetwork statistics view name as the object name."""
+        return self.view.name
+
+    def iter_rows(self) -> Iterator[Tuple[str, List[str]]]:
+        """Read the statistics view page by page and yield (row key, row values) for each row.
+
+        Flow statistics key is composed of all columns before the Tx Frames column, for all other views the key is the
+        name caption column.
+        The view page is a single server side object so the reader is locked until all rows are read.
+        """
+        with self.lock:
+            yield from self._iter_rows()
+
+    def _iter_rows(self) -> Iterator[Tuple[str, List[str]]]:
+        page = self.view.ixn_view.get_child_static("page")
+        if is_false(page.get_attribute("isReady")):
+            raise TgnError(f'"{page.obj}" not ready')
+        captions = page.get_list_attribute("columnCaptions")
+        key_index = captions.index(self.view.name_caption)
+        next_index = key_index + 1
+        self.captions = captions[key_index:] if self.flow_view else captions[:key_index] + captions[next_index:]
+        page.set_attributes(pageSize=self.page_size)
+        for page_num in range(1, int(page.get_attribute("totalPages")) + 1):
+            page.set_attributes(commit=True, currentPage=page_num)
+            for row in page.get_list_attribute("pageValues"):
+                if self.flow_view:
+                    yield "/".join(row[:key_index]), row[key_index:]
+                else:
+                    yield row[key_index], row[:key_index] + row[next_index:]
+
+    def read(self) -> Dict[str, Dict[str, str]]:
+        """Read the full statistics table - {row key: {caption: value}}."""
+        statistics = OrderedDict()
+        for key, row in self.iter_rows():
+            statistics[key] = dict(zip(self.captions, row))
+        return statistics
+
+    def read_delta(self) -> Dict[str, Dict[str, str]]:
+        """Read only rows that changed since the previous call.
+
+        Each returned row is extended with "<caption> Rate" columns calculated from the previous snapshot, rate columns
+        are empty for rows that are new since the previous call. The first call returns all rows.
+        """
+        now = time.time()
+        interval = now - self.snapshot_time
+        snapshot = {}
+        rate_captions = set()
+        statistics = OrderedDict()
+        for key, row in self.iter_rows():
+            snapshot[key] = row
+            previous_row = self.snapshot.get(key)
+            if row == previous_row:
+                continue
+            statistics[key] = dict(zip(self.captions, row))
+            for caption, value, previous_value in zip(self.captions, row, previous_row or [None] * len(row)):
+                rate = _rate(value, previous_value, interval)
+                if rate is not None:
+                    statistics[key][f"{caption} Rate"] = rate
+                    rate_captions.add(caption)
+        self.snapshot, self.snapshot_time = snapshot, now
+        self.rate_captions = [f"{caption} Rate" for caption in self.captions if caption in rate_captions]
+        return statistics
+
+    @property
+    def delta_captions(self) -> List[str]:
+        """Captions of the last read_delta rows - all view captions followed by the rate captions of numeric columns."""
+        return self.captions + self.rate_captions
+
+
+class IxnStatisticsTable:
+    """Columnar statistics table - row keys, captions and one column of view values per caption.
+
+    Columns keep the exact view text, as lists of interned strings so the repeated port, traffic item and flow group
+    names and the repeated values of flow views are stored once. A column is converted to numbers only when compared
+    (where, top), to NumPy float64 array (Python list of int/float if NumPy is not installed), and the conversion is
+    kept for the following comparisons.
+
+    Predicates passed to where are applied to the whole numeric column at once with NumPy (e.g. lambda v: v > 0),
+    combine conditions with & and | instead of and/or.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        captions: List[str],
+        columns: List[List[str]],
+        numbers: Optional[Dict[int, Sequence[float]]] = None,
+    ) -> None:
+        """Create table from columns, use read to create table from statistics view.
+
+        :param numbers: {column index: column values converted to numbers} of already converted columns.
+        """
+        self.keys = keys
+        self.captions = captions
+        self.columns = columns
+        self.index = {caption: index for index, caption in enumerate(captions)}
+        self.numbers = numbers if numbers is not None else {}
+
+    @classmethod
+    def read(
+        cls, reader: IxnStatisticsReader, columns: Optional[List[str]] = None, key_filter: Optional[str] = None
+    ) -> "IxnStatisticsTable":
+        """Read the statistics view into new table, with only the requested columns and rows.
+
+        :param columns: Captions of the columns to keep, None - keep all columns.
+        :param key_filter: Regular expression, keep only rows with matching row key (search), None - keep all rows.
+        """
+        return cls.from_rows(reader.iter_rows(), reader, columns, key_filter)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Tuple[str, List[str]]],
+        reader: Union[IxnStatisticsReader, List[str]],
+        columns: Optional[List[str]] = None,
+        key_filter: Optional[str] = None,
+    ) -> "IxnStatisticsTable":
+        """Create table from (row key, row values) rows, with only the requested columns and rows.
+
+        Rows are filtered and projected as they are read so the rest of the view is never held in memory.
+
+        :param reader: Reader that yields the rows (captions are known only after the first row) or list of captions.
+        :param columns: Captions of the columns to keep, None - keep all columns.
+        :param key_filter: Regular expression, keep only rows with matching row key (search), None - keep all rows.
+        """
+        key_regex = re.compile(key_filter) if key_filter else None
+        projection: Optional[Callable] = None
+        keys: List[str] = []
+        values: List[str] = []
+        for key, row in rows:
+            if columns and not projection:
+                projection = _projection(reader, columns)
+            if key_regex and not key_regex.search(key):
+                continue
+            keys.append(key)
+            values.extend(projection(row) if projection else row)
+        captions = list(reader if isinstance(reader, list) else reader.captions)
+        if columns:
+            if not projection:
+                _projection(reader, columns)  # validate columns of empty view
+            captions = list(columns)
+        step = len(captions)
+        return cls(keys, captions, [[sys.intern(value) for value in values[index::step]] for index in range(step)])
+
+    def __len__(self) -> int:
+        """Return number of rows."""
+        return len(self.keys)
+
+    def caption(self, caption: str) -> str:
+        """Return the caption, or the first caption with the caption suffix (e.g. Store-Forward Avg Latency (ns))."""
+        for table_caption in self.captions:
+            if table_caption == caption or table_caption.endswith(f" {caption}"):
+                return table_caption
+        raise StatisticsQueryError(f'Statistics table has no "{caption}" column')
+
+    def numeric(self, caption: str) -> Sequence[float]:
+        """Return column as numbers, non numeric values are NaN."""
+        if caption not in self.index:
+            raise StatisticsQueryError(f'Statistics table has no "{caption}" column')
+        index = self.index[caption]
+        if index not in self.numbers:
+            self.numbers[index] = _numbers(self.columns[index])
+        return self.numbers[index]
+
+    def totals(self, captions: Optional[List[str]] = None) -> Dict[str, Union[int, float]]:
+        """Return {caption: sum of column} of the requested numeric columns, all numeric columns if captions is None.
+
+        A column is numeric if all its values are numbers with the same number of decimals (as IxNetwork formats counters
+        and rates), counters are summed as Python int so the totals of large counters are exact.
+        """
+        totals: Dict[str, Union[int, float]] = {}
+        for caption in captions or self.captions:
+            column = self.columns[self.index[caption]]
+            decimals = _decimals(column)
+            if decimals == 0:
+                totals[caption] = sum(map(int, column))
+            elif decimals:
+                totals[caption] = math.fsum(map(float, column))
+        return totals
+
+    def where(self, caption: str, predicate: Callable) -> "IxnStatisticsTable":
+        """Return new table with the rows where the predicate over the caption column values is True."""
+        column = self.numeric(caption)
+        if numpy:
+            return self.take(numpy.flatnonzero(predicate(column)).tolist())
+        return self.take([index for index, value in enumerate(column) if predicate(value)])
+
+    def top(self, caption: str, count: int, largest: bool = True) -> "IxnStatisticsTable":
+        """Return new table with the count rows with the largest (or smallest) caption column values, NaN excluded."""
+        column = self.numeric(caption)
+        if numpy:
+            valid = numpy.flatnonzero(~numpy.isnan(column))
+            order = valid[numpy.argsort(numpy.asarray(column)[valid], kind="stable")]
+            return self.take((order[::-1] if largest else order)[:count].tolist())
+        indexes = [index for index, value in enumerate(column) if not math.isnan(value)]
+        return self.take(sorted(indexes, key=lambda index: column[index], reverse=largest)[:count])
+
+    def take(self, indexes: List[int]) -> "IxnStatisticsTable":
+        """Return new table with the rows at indexes, in indexes order."""
+        columns = [[column[index] for index in indexes] for column in self.columns]
+        numbers = {
+            column_index: numpy.asarray(column)[indexes] if numpy else [column[index] for index in indexes]
+            for column_index, column in self.numbers.items()
+        }
+        return IxnStatisticsTable([self.keys[index] for index in indexes], self.captions, columns, numbers)
+
+    def select(self, captions: List[str]) -> "IxnStatisticsTable":
+        """Return new table with the columns of captions only, in captions order."""
+        return IxnStatisticsTable(self.keys, list(captions), [self.columns[self.index[caption]] for caption in captions])
+
+    def iter_rows(self) -> Iterator[Tuple[str, List[str]]]:
+        """Yield (row key, row values) for each row, with the same text as the view."""
+        yield from zip(self.keys, (list(row) for row in zip(*self.columns)))
+
+    def iter_table(self) -> Iterator[List[str]]:
+        """Yield the captions row followed by all values rows."""
+        yield self.captions
+        for _, row in self.iter_rows():
+            yield row
+
+    def to_dict(self) -> Dict[str, Dict[str, str]]:
+        """Return the table as {row key: {caption: value}}."""
+        return OrderedDict((key, dict(zip(self.captions, row))) for key, row in self.iter_rows())
+
+
+# pylint: disable=too-many-instance-attributes
+ReadView = Callable[[str, Optional[str], Callable[[IxnStatisticsReader], None]], None]
+
+
+class IxnStatisticsRecorder:
+    """Record statistics views samples in a background thread to gzip compressed CSV file per view.
+
+    Each sample is streamed page by page to the files so memory usage does not depend on the recording duration.
+    Views are read with the read_view callback on every sample, so views re-created by IxNetwork (e.g. on traffic apply)
+    are resolved again.
+    """
+
+    def __init__(
+        self, views: List[Tuple[str, Optional[str]]], read_view: ReadView, interval: float, logger: logging.Logger
+    ) -> None:
+        """Create recorder, call start to start recording.
+
+        :param views: (view name, table key) of all views to record.
+        :param read_view: Calls read function with the current reader of the view (view name, table key, read function).
+        :param interval: sampling interval in seconds.
+        """
+        self.views = views
+        self.read_view = read_view
+        self.interval = interval
+        self.logger = logger
+        self.directory = Path(tempfile.mkdtemp(prefix="ixn_statistics_"))
+        self.files = {name: self.directory.joinpath(f"{name.replace(' ', '_')}.csv.gz") for name, _ in views}
+        self.samples = 0
+        self._headers: List[str] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._record, name="ixn-statistics-recorder", daemon=True)
+
+    def start(self) -> None:
+        """Start recording."""
+        self.logger.info(f"Start recording {list(self.files)} every {self.interval} seconds")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop recording and wait for the last sample to complete."""
+        self._stop.set()
+        self._thread.join()
+        self.logger.info(f"Stopped recording {list(self.files)} after {self.samples} samples")
+
+    def remove_files(self) -> None:
+        """Remove all recording files."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    @property
+    def is_recording(self) -> bool:
+        """True if the recording thread is running."""
+        return self._thread.is_alive()
+
+    def _record(self) -> None:
+        files = {name: gzip.open(file_name, "wt", newline="") for name, file_name in self.files.items()}
+        try:
+            writers = {name: csv.writer(file) for name, file in files.items()}
+            while not self._stop.is_set():
+                sample_time = time.time()
+                for view_name, table_key in self.views:
+                    sample = functools.partial(self._sample, writer=writers[view_name], sample_time=sample_time)
+                    try:
+                        self.read_view(view_name, table_key, sample)
+                    except Exception as error:  # pylint: disable=broad-except
+                        self.logger.warning(f"Failed to sample {view_name} - {error}")
+                self.samples += 1
+                self._stop.wait(max(0.0, self.interval - (time.time() - sample_time)))
+        finally:
+            for file in files.values():
+                file.close()
+
+    def _sample(self, reader: IxnStatisticsReader, writer: Any, sample_time: float) -> None:
+        timestamp = f"{sample_time:.3f}"
+        for key, row in reader.iter_rows():
+            if str(reader) not in self._headers:
+                writer.writerow(["Time", "Key"] + reader.captions)
+                self._headers.append(str(reader))
+            writer.writerow([timestamp, key] + row)
+
+
+def statistics_to_json(statistics: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """Return statistics table as JSON compatible dictionary sorted by row keys and captions."""
+    return {key: dict(sorted(statistics[key].items())) for key in sorted(statistics)}
+
+
+def dict_rows(captions: List[str], statistics: Dict[str, Dict[str, str]]) -> Iterator[List[str]]:
+    """Yield the captions row followed by the values of all statistics table rows, missing values are empty."""
+    yield captions
+    for row in statistics.values():
+        yield [row.get(caption, "") for caption in captions]
+
+
+def merge_statistics(
+    statistics: Dict[str, Tuple[List[str], Dict[str, Dict[str, str]]]]
+) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+    """Merge statistics tables of multiple controllers into one table with Controller column.
+
+    :param statistics: {controller name: (captions, statistics table)}
+    :return: (Controller caption followed by all tables captions, {controller name/row key: {caption: value}})
+    """
+    captions = ["Controller"]
+    merged = OrderedDict()
+    for controller, (controller_captions, table) in statistics.items():
+        captions.extend(caption for caption in controller_captions if caption not in captions)
+        for key, row in table.items():
+            merged[f"{controller}/{key}"] = {"Controller": controller, **row}
+    return captions, merged
+
+
+def traffic_verdict(reader: IxnStatisticsReader, thresholds: Dict[str, float]) -> dict:
+    """Evaluate thresholds over the statistics view columns and return verdict with the offending rows only.
+
+    Each threshold is evaluated over its whole column. Non numeric values violate the threshold. An empty view fails.
+
+    :param thresholds: {VERDICT_THRESHOLDS name: threshold value}
+    :return: {"verdict": PASS/FAIL, "rows": number of rows, "worst": {name: worst value},
+        "failures": {row key: {caption: offending value}}}
+    """
+    check_thresholds(thresholds)
+    table = IxnStatisticsTable.read(reader)
+    worst: Dict[str, float] = {}
+    failures: Dict[str, Dict[str, str]] = OrderedDict()
+    for name, threshold in thresholds.items():
+        caption, is_max = table.caption(VERDICT_THRESHOLDS[name][0]), VERDICT_THRESHOLDS[name][1]
+        worst_rows = table.top(caption, 1, largest=is_max)
+        if len(worst_rows):
+            worst[name] = float(worst_rows.numeric(caption)[0])
+        offending = table.where(caption, _violates(threshold, is_max))
+        for key, row in offending.iter_rows():
+            failures.setdefault(key, {})[caption] = row[offending.index[caption]]
+    return {
+        "verdict": "PASS" if len(table) and not failures else "FAIL",
+        "rows": len(table),
+        "worst": worst,
+        "failures": failures,
+    }
+
+
+def check_thresholds(thresholds: Dict[str, float]) -> None:
+    """Raise StatisticsQueryError if any threshold name is not in VERDICT_THRESHOLDS."""
+    unknown = set(thresholds) - set(VERDICT_THRESHOLDS)
+    if unknown:
+        raise StatisticsQueryError(f"Unknown thresholds {sorted(unknown)} - use {list(VERDICT_THRESHOLDS)}")
+
+
+def parse_conditions(conditions: str) -> List[Tuple[str, Callable]]:
+    """Parse semicolon separated numeric conditions, e.g. "Loss % > 0; Rx Frames >= 1000".
+
+    :return: [(caption, predicate)] - predicates to pass to IxnStatisticsTable.where.
+    """
+    predicates = []
+    for condition in [c.strip() for c in conditions.split(";") if c.strip()]:
+        match = CONDITION_REGEX.fullmatch(condition)
+        value = _float(match.group(3)) if match else None
+        if value is None:
+            raise StatisticsQueryError(
+                f'Invalid condition "{condition}" - use <caption> <{"|".join(CONDITION_OPERATORS)}> <number>'
+            )
+        predicates.append((match.group(1), lambda v, o=CONDITION_OPERATORS[match.group(2)], t=value: o(v, t)))
+    return predicates
+
+
+def select_statistics(
+    table: IxnStatisticsTable, columns: List[str], conditions: List[Tuple[str, Callable]]
+) -> IxnStatisticsTable:
+    """Return the table rows that match all conditions, with only the requested columns.
+
+    :param table: Table with the requested columns and the columns of the conditions.
+    :param columns: Captions of the columns to return, if empty return all columns.
+    :param conditions: [(caption, predicate)] as returned by parse_conditions.
+    """
+    for caption, predicate in conditions:
+        table = table.where(caption, predicate)
+    return table.select(columns) if columns and table.captions != columns else table
+
+
+def _projection(reader: Union[IxnStatisticsReader, List[str]], columns: List[str]) -> Callable[..., Tuple[str, ...]]:
+    """Return function that returns the values of the requested columns from a row, in the requested columns order."""
+    captions = reader if isinstance(reader, list) else reader.captions
+    unknown = [column for column in columns if column not in captions]
+    if unknown:
+        raise StatisticsQueryError(f"Unknown columns {unknown} - use {captions}")
+    indexes = [captions.index(column) for column in columns]
+    if len(indexes) == 1:
+        return lambda row: (row[indexes[0]],)
+    return operator.itemgetter(*indexes)
+
+
+def _violates(threshold: float, is_max: bool) -> Callable:
+    """Return predicate that is True for values over (or under) the threshold and for NaN (non numeric) values."""
+    if is_max:
+        return lambda v: (v > threshold) | (v != v)  # pylint: disable=comparison-with-itself
+    return lambda v: (v < threshold) | (v != v)  # pylint: disable=comparison-with-itself
+
+
+def _decimals(values: Sequence[str]) -> Optional[int]:
+    """Return the number of decimals if all values are numbers with the same number of decimals, else None.
+
+    The column is validated with a single regular expression match over all values joined, instead of match per value.
+    """
+    first = NUMBER_REGEX.fullmatch(values[0]) if values else None
+    if not first:
+        return None
+    decimals = len(first.group(1) or "")
+    number = rf"-?[0-9]+\.[0-9]{{{decimals}}}" if decimals else "-?[0-9]+"
+    return decimals if re.fullmatch(rf"(?:{number}\n)*{number}", "\n".join(values)) else None
+
+
+def _numbers(values: Sequence[str]) -> Sequence[float]:
+    """Return values as NumPy float64 array (list of int/float if NumPy is not installed), non numeric values are NaN."""
+    if numpy:
+        try:
+            return numpy.array(values, dtype=numpy.float64)
+        except ValueError:
+            return numpy.array([math.nan if value is None else value for value in map(_float, values)], dtype=numpy.float64)
+    return [_number(value) for value in values]
+
+
+def _number(value: str) -> float:
+    """Return value as Python int for integer text, else as float, NaN if not numeric."""
+    match = NUMBER_REGEX.fullmatch(value)
+    if match and not match.group(1):
+        return int(value)
+    number = _float(value)
+    return math.nan if number is None else number
+
+
+def _float(value: str) -> Optional[float]:
+    """Return value as float, None if not numeric."""
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def iter_csv(rows: Iterable[List[str]], chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[str]:
+    """Yield CSV text of rows in chunks of chunk_rows rows, without line terminator after the last row."""
+    buffer = io.StringIO()
+    csv_writer = csv.writer(buffer, lineterminator="")
+    for index, row in enumerate(rows):
+        if index:
+            buffer.write("\r\n")
+            if not index % chunk_rows:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        csv_writer.writerow(row)
+    yield buffer.getvalue()
+
+
+def _rate(value: str, previous_value: Optional[str], interval: float) -> Optional[str]:
+    """Return the rate per second between two numeric counter values, empty string for new rows, None if not numeric."""
+    try:
+        current = float(value)
+    except ValueError:
+        return None
+    if previous_value is None or not interval:
+        return ""
+    try:
+        return f"{(current - float(previous_value)) / interval:.2f}"
+    except ValueError:
+        return None
@@ -0,0 +1,259 @@
+"""
+IxNetwork controller shell utilities.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import copy_context
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Iterator, List, Mapping, Optional, Tuple, TypeVar, cast
+
+import requests
+
+if TYPE_CHECKING:
+    from ixnetwork.api.ixn_rest import IxnRestWrapper
+    from ixnetwork.ixn_root import IxnRoot
+
+MAX_WORKERS = 16
+
+# pyixnetwork creates ports, traffic items and statistics views under the root of the last connected session (class
+# attribute), so with multiple sessions in the same process objects discovery must be bound to the handler session.
+# Every write of the root (connect, pooled session reuse, discovery) is done under this lock.
+ROOT_LOCK = threading.RLock()
+
+T = TypeVar("T")
+
+
+@contextmanager
+def bound_root(root: "IxnRoot") -> Iterator[None]:
+    """Bind pyixnetwork objects discovery to the session root, other sessions discovery waits until exit."""
+    from ixnetwork.ixn_object import IxnObject  # pylint: disable=import-outside-toplevel
+
+    with ROOT_LOCK:
+        IxnObject.root = root
+        yield
+
+
+class TaskResult:
+    """Outcome of a single task executed by run_concurrently."""
+
+    def __init__(self, name: str) -> None:
+        """Create pending task result."""
+        self.name = name
+        self.start = 0.0
+        self.end = 0.0
+        self.result: object = None
+        self.error: Optional[Exception] = None
+        self.timed_out = False
+
+    def __str__(self) -> str:
+        """Return one line summary of the task outcome."""
+        if self.timed_out:
+            return f"{self.name}: timed out"
+        if self.error:
+            return f"{self.name}: failed after {self.duration:.2f}s - {self.error}"
+        return f"{self.name}: completed in {self.duration:.2f}s"
+
+    @property
+    def duration(self) -> float:
+        """Task duration in seconds."""
+        return self.end - self.start
+
+    @property
+    def ok(self) -> bool:
+        """True if the task completed without errors."""
+        return not self.timed_out and self.error is None
+
+
+def run_concurrently(
+    func: Callable[..., object], tasks: Mapping[str, tuple], timeout: float, max_workers: int = MAX_WORKERS, join: bool = False
+) -> Dict[str, TaskResult]:
+    """Run func concurrently for all tasks arguments with bounded worker pool and overall deadline.
+
+    Tasks still running when timeout expires are marked as timed out, the worker threads are left to complete in the
+    background so func should respect the deadline itself whenever possible.
+    Each task runs in a copy of the caller context, so context variables (e.g. the running command of the performance
+    metrics) are passed to the workers.
+
+    :param func: function to run.
+    :param tasks: {task name: func arguments}.
+    :param timeout: overall timeout in seconds for all tasks.
+    :param max_workers: max number of concurrent workers.
+    :param join: True - return only after all started workers stopped, func must respect the deadline itself.
+    """
+    results = {name: TaskResult(name) for name in tasks}
+
+    def _run(name: str, args: tuple) -> None:
+        result = results[name]
+        result.start = time.time()
+        try:
+            result.result = func(*args)
+        except Exception as error:  # pylint: disable=broad-except
+            result.error = error
+        result.end = time.time()
+
+    if not tasks:
+        return results
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)))
+    futures: Dict[Future, str] = {executor.submit(copy_context().run, _run, name, args): name for name, args in tasks.items()}
+    _, not_done = wait(futures, timeout=timeout)
+    now = time.time()
+    for future in not_done:
+        future.cancel()
+    executor.shutdown(wait=join)
+    for future in not_done:
+        result = results[futures[future]]
+        result.timed_out = True
+        result.start = result.start or now
+        result.end = result.end or now
+    return results
+
+
+def log_task_results(logger: logging.Logger, title: str, results: Dict[str, TaskResult]) -> None:
+    """Log timing report of run_concurrently results, slowest tasks first."""
+    logger.info(f"{title} - {len(results)} tasks")
+    for result in sorted(results.values(), key=lambda r: r.duration, reverse=True):
+        logger.info(f"    {result}")
+
+
+def file_hash(file_name: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Return SHA256 hex digest of the file content."""
+    sha = hashlib.sha256()
+    with open(file_name, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def upload_file(api: "IxnRestWrapper", file_name: Path, server_file_name: str) -> None:
+    """Stream local file to the session files, the file is never read into memory as a whole."""
+    with open(file_name, "rb") as f:
+        response = api.request(
+            requests.post,
+            f"{api.root_url}ixnetwork/files",
+            headers={"content-type": "application/octet-stream"},
+            data=f,
+            params={"filename": server_file_name},
+        )
+    if "id" in response.json():
+        api.wait_for_complete(response)
+
+
+def delete_file(api: "IxnRestWrapper", server_file_name: str) -> None:
+    """Delete file from the session files."""
+    api.request(requests.delete, f"{api.root_url}ixnetwork/files", params={"filename": server_file_name})
+
+
+class ObjectCache:
+    """Read-through cache with time to live and LRU eviction.
+
+    The cache is disabled (all reads go to the loader) while ttl is 0.
+    """
+
+    def __init__(self, ttl: float = 0, max_entries: int = 1024) -> None:
+        """Create empty cache.
+
+        :param ttl: Time to live of cache entries in seconds.
+        :param max_entries: Max number of entries, least recently used entries are evicted first.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], T]) -> T:
+        """Return cached value of key, if key is missing or expired call loader and cache its result."""
+        if not self.ttl:
+            return loader()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cast(T, entry[1])
+            self.misses += 1
+        value = loader()
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Invalidate all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, float]:
+        """Return cache settings and hit/miss counters."""
+        return {
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class UploadCache:
+    """Server side files uploaded by content hash with total size budget.
+
+    Least recently used files are evicted (no longer referenced) when the total size of the files exceeds the budget.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """Create empty cache.
+
+        :param max_bytes: Max total size of the cached files.
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, Tuple[str, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, content_hash: str) -> Optional[str]:
+        """Return server side file name of the content hash, None if not uploaded."""
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            if not entry:
+                return None
+            self._entries.move_to_end(content_hash)
+            return entry[0]
+
+    def add(self, content_hash: str, file_name: str, size: int) -> List[str]:
+        """Add uploaded file and return the server side file names evicted to keep the total size within the budget."""
+        evicted = []
+        with self._lock:
+            self._entries[content_hash] = (file_name, size)
+            self._entries.move_to_end(content_hash)
+            while len(self._entries) > 1 and self.size > self.max_bytes:
+                evicted.append(self._entries.popitem(last=False)[1][0])
+        return evicted
+
+    def remove(self, content_hash: str) -> None:
+        """Remove file, e.g. if it no longer exists on the server."""
+        with self._lock:
+            self._entries.pop(content_hash, None)
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached files."""
+        return sum(size for _, size in self._entries.values())
+
+
+def prune_subtree(node: dict, depth: int) -> dict:
+    """Remove from select result node all descendants deeper than depth."""
+    pruned = {}
+    for key, value in node.items():
+        if isinstance(value, list) and value and isinstance(value[0], dict) and "href" in value[0]:
+            if depth > 0:
+                pruned[key] = [prune_subtree(child, depth - 1) for child in value]
+        else:
+            pruned[key] = value
+    return pruned
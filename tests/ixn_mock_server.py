@@ -0,0 +1,513 @@
+"""
+Minimal IxNetwork REST API server to run the controller shell offline.
+
+The server implements just enough of the IxNetwork REST API to run the shell commands - sessions, load configuration,
+vports reservation, topologies start/stop, select, traffic operations, paged statistics views and one quick test ("RFC
+2544", completes immediately on start) - with configurable per request latency.
+All operations complete synchronously, with async_operations the server still reports each operation in progress once so
+the REST wrapper waits for operation progress. Topologies and device groups report the new status protocols_duration
+seconds after start/stop.
+"""
+import itertools
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+SESSIONS_URL = "/api/v1/sessions"
+
+CARDS_PER_CHASSIS = 4
+PORTS_PER_CARD = 16
+
+PORT_CAPTIONS = [
+    "Stat Name",
+    "Port Name",
+    "Line Speed",
+    "Link State",
+    "Frames Tx.",
+    "Valid Frames Rx.",
+    "Bytes Tx.",
+    "Bytes Rx.",
+]
+TRAFFIC_ITEM_CAPTIONS = ["Traffic Item", "Tx Frames", "Rx Frames", "Frames Delta", "Loss %", "Tx Frame Rate", "Rx Frame Rate"]
+FLOW_CAPTIONS = ["Tx Port", "Rx Port", "Traffic Item", "Flow Group", *TRAFFIC_ITEM_CAPTIONS[1:]]
+
+
+# pylint: disable=too-many-instance-attributes
+class IxnMockSession:
+    """Single IxNetwork session - objects tree and configuration state."""
+
+    def __init__(self, server: "IxnMockServer", session_id: int) -> None:
+        """Create session with empty configuration."""
+        self.server = server
+        self.id = session_id
+        self.prefix = f"{SESSIONS_URL}/{session_id}/"
+        self.objects: Dict[str, dict] = {}
+        self.ids: Counter[str] = Counter()
+        self.pages: Dict[str, dict] = {}
+        self.files: Dict[str, int] = {}
+        self.protocols: Dict[str, Tuple[str, float]] = {}
+        self.progress: Dict[str, dict] = {}
+        self.traffic_stop_time = 0.0
+        self.traffic_samples = 0
+        self.lock = threading.RLock()
+        self._add("ixnetwork", buildNumber="9.10.2007.7")
+        self._add("ixnetwork/globals", buildNumber="9.10.2007.7")
+        self._add("ixnetwork/globals/preferences", connectPortsOnLoadConfig=True)
+        self._add("ixnetwork/globals/licensing", licensingServers=["localhost"], mode="mixed", tier="tier3")
+        self._add("ixnetwork/availableHardware")
+        self._add("ixnetwork/statistics")
+        self._add("ixnetwork/quickTest")
+        quick_test = self._add("ixnetwork/quickTest/rfc2544throughput", name="RFC 2544")
+        self._add(f"{quick_test}/results", isRunning=False, status="", progress="", result="", duration="")
+        for caption in ["Port Statistics", "Traffic Item Statistics", "Flow Statistics"]:
+            self._add("ixnetwork/statistics/view", caption=caption, visible=True)
+        self.new_config()
+
+    def new_config(self) -> None:
+        """Clear configuration - remove all vports and traffic items."""
+        with self.lock:
+            for path in [p for p in self.objects if re.match("ixnetwork/(vport|traffic|topology)", p)]:
+                del self.objects[path]
+            for collection in [c for c in self.ids if re.match("ixnetwork/(vport|traffic|topology)", c)]:
+                del self.ids[collection]
+            self._add("ixnetwork/traffic", state="unapplied")
+
+    def load_config(self) -> None:
+        """Replace configuration with synthetic configuration of server.ports vports and server.traffic_items items.
+
+        Each pair of vports has a topology with one device group.
+        """
+        with self.lock:
+            self.new_config()
+            for index in range(1, self.server.ports + 1):
+                self._add(
+                    "ixnetwork/vport",
+                    name=f"Port {index}",
+                    type="ethernet",
+                    connectedTo="null",
+                    state="unassigned",
+                    stateDetail="idle",
+                    connectionState="unassigned",
+                )
+            vports = self._children("ixnetwork/vport")
+            for index in range(1, (len(vports) + 1) // 2 + 1):
+                topology = self._add(
+                    "ixnetwork/topology",
+                    name=f"Topology {index}",
+                    vports=[self.prefix + p for i, p in enumerate(vports) if i // 2 + 1 == index],
+                    status="notStarted",
+                )
+                self._add(f"{topology}/deviceGroup", name=f"Device Group {index}", status="notStarted")
+            for index in range(1, self.server.traffic_items + 1):
+                self._add("ixnetwork/traffic/trafficItem", name=f"Traffic Item {index}", trafficItemType="l2L3", enabled=True)
+
+    #
+    # REST methods.
+    #
+
+    def get(self, path: str) -> Tuple[int, object]:
+        """Return object attributes, list of children or statistics view page."""
+        with self.lock:
+            if re.fullmatch(r"ixnetwork/statistics/view/\d+/page", path):
+                if path.rsplit("/", maxsplit=1)[0] not in self.objects:
+                    return 404, {"errors": [f"{path} not found"]}
+                return 200, self._get_page(path)
+            if path == "ixnetwork/traffic":
+                self._update_traffic_state()
+            if path in self.progress:
+                return 200, self.progress[path]
+            if path in self.objects:
+                return 200, self._object(path)
+            if re.fullmatch(r".*/\d+", path):
+                return 404, {"errors": [f"{path} not found"]}
+            return 200, [self._object(p) for p in self._children(path)]
+
+    def post(self, path: str, data: dict) -> Tuple[int, object]:
+        """Upload file, run operation or add new object."""
+        if path == "ixnetwork/files":
+            return 200, {}
+        if path.endswith("/operations/loadconfig") and data.get("arg1") not in self.files:
+            return 400, {"errors": [f"{data.get('arg1')} not found"]}
+        if path.endswith("/operations/select"):
+            return self._complete(path, self._select(data["selects"]))
+        if "/operations/" in path:
+            return self._complete(path, self._operation(path, data))
+        if path == "ixnetwork/availableHardware/chassis":
+            return 201, self._object(self._add_chassis(data["hostname"]))
+        return 201, self._object(self._add(path, **data))
+
+    def patch(self, path: str, data: dict) -> Tuple[int, object]:
+        """Set object attributes."""
+        with self.lock:
+            if re.fullmatch(r"ixnetwork/statistics/view/\d+/page", path):
+                self.pages.setdefault(path, {"pageSize": 50, "currentPage": 1}).update(data)
+                return 200, {}
+            if path not in self.objects:
+                return 404, {"errors": [f"{path} not found"]}
+            self.objects[path].update(data)
+            if "connectedTo" in data:
+                connected = data["connectedTo"] != "null"
+                state = "up" if connected else "unassigned"
+                self.objects[path].update(state=state, connectionState="connectedLinkUp" if connected else state)
+            return 200, {}
+
+    def delete(self, path: str) -> Tuple[int, object]:
+        """Remove object and all its descendants."""
+        with self.lock:
+            for descendant in [p for p in self.objects if p == path or p.startswith(path + "/")]:
+                del self.objects[descendant]
+        return 200, {}
+
+    def options(self, path: str) -> Tuple[int, object]:
+        """Return object meta-data - children types and attributes names only."""
+        with self.lock:
+            attributes = [{"name": name} for name in self.objects.get(path, {})]
+            children = {m.group(1) for m in (re.fullmatch(rf"{re.escape(path)}/(\w+)(/\d+)?", p) for p in self.objects) if m}
+        children_types = [{"name": name} for name in sorted(children)]
+        return 200, {"custom": {"children": children_types, "attributes": attributes, "operations": []}}
+
+    #
+    # Helpers.
+    #
+
+    def _add(self, path: str, **attributes: object) -> str:
+        """Add object under collection path, singleton objects (no collection) are added as is."""
+        with self.lock:
+            if path.rsplit("/", maxsplit=1)[-1] in [
+                "vport",
+                "topology",
+                "deviceGroup",
+                "trafficItem",
+                "view",
+                "chassis",
+                "card",
+                "port",
+                "rfc2544throughput",
+            ]:
+                self.ids[path] += 1
+                path = f"{path}/{self.ids[path]}"
+            self.objects[path] = attributes
+            return path
+
+    def _complete(self, path: str, result: object) -> Tuple[int, object]:
+        """Return completed operation response, with async_operations return in progress response with progress url."""
+        response = {"state": "SUCCESS", "progress": 100, "result": result}
+        if not self.server.async_operations:
+            return 200, response
+        with self.lock:
+            self.ids[path] += 1
+            progress = f"{path}/{self.ids[path]}"
+            self.progress[progress] = response
+        return 202, {"id": self.ids[path], "state": "IN_PROGRESS", "progress": 0, "url": self.prefix + progress}
+
+    def _add_chassis(self, hostname: str) -> str:
+        """Add chassis with CARDS_PER_CHASSIS cards and PORTS_PER_CARD ports per card, return existing chassis if any."""
+        with self.lock:
+            for path in self._children("ixnetwork/availableHardware/chassis"):
+                if self.objects[path]["hostname"] == hostname:
+                    return path
+            chassis = self._add("ixnetwork/availableHardware/chassis", hostname=hostname, state="ready")
+            for card_id in range(1, CARDS_PER_CHASSIS + 1):
+                card = self._add(f"{chassis}/card", cardId=card_id)
+                for port_id in range(1, PORTS_PER_CARD + 1):
+                    self._add(f"{card}/port", portId=port_id, owner="")
+            return chassis
+
+    def _object(self, path: str) -> dict:
+        """Return object as returned by IxNetwork REST API - attributes and links."""
+        object_id = int(path.rsplit("/", maxsplit=1)[-1]) if path[-1].isdigit() else None
+        return {"id": object_id, **self.objects[path], "links": [{"href": self.prefix + path}]}
+
+    def _children(self, path: str) -> List[str]:
+        """Return paths of all children in collection path, ordered by id."""
+        children = [p for p in self.objects if re.fullmatch(rf"{re.escape(path)}/\d+", p)]
+        return sorted(children, key=lambda p: int(p.rsplit("/", maxsplit=1)[-1]))
+
+    def _operation(self, path: str, data: dict) -> Optional[str]:
+        """Run operation synchronously, operations results are not simulated except for quick test report path."""
+        operation = path.split("/")[-1].lower()
+        with self.lock:
+            traffic = self.objects.get("ixnetwork/traffic", {})
+            if path.startswith("ixnetwork/quickTest/"):
+                return self._quick_test_operation(operation, data["arg1"].replace(self.prefix, ""))
+            if operation == "loadconfig":
+                self.load_config()
+            elif operation == "newconfig":
+                self.new_config()
+            elif operation == "releaseport":
+                for vport in data.get("arg1", []):
+                    self.patch(vport.replace(self.prefix, ""), {"connectedTo": "null"})
+            elif operation in ["start", "stop"]:
+                status = "started" if operation == "start" else "notStarted"
+                for obj_ref in data.get("arg1", []):
+                    obj_path = obj_ref.replace(self.prefix, "")
+                    for obj_child in [p for p in self.objects if p == obj_path or p.startswith(obj_path + "/")]:
+                        self.protocols[obj_child] = (status, time.time() + self.server.protocols_duration)
+            elif operation == "generate":
+                traffic["state"] = "unapplied"
+            elif operation == "apply":
+                traffic["state"] = "stopped"
+            elif operation.startswith("startstatelesstraffic"):
+                traffic["state"] = "started"
+                self.traffic_stop_time = time.time() + self.server.traffic_duration
+                self.traffic_samples += 1
+            elif operation.startswith("stopstatelesstraffic"):
+                traffic["state"] = "stopped"
+        return None
+
+    def _quick_test_operation(self, operation: str, quick_test: str) -> Optional[str]:
+        """Run quick test operation - start completes the test immediately, generateReport returns the report path."""
+        if operation == "start":
+            self.objects[f"{quick_test}/results"].update(status="Test complete", result="pass", duration="00:00:01")
+        if operation == "generatereport":
+            return f"C:/Results/{self.objects[quick_test]['name']}.pdf"
+        return None
+
+    def _select(self, selects: List[dict]) -> List[dict]:
+        """Return selected objects properties and children, children types are matched at any depth."""
+        with self.lock:
+            return [self._select_node(s["from"].replace(self.prefix, ""), s["properties"], s["children"]) for s in selects]
+
+    def _select_node(self, path: str, properties: List[str], children: List[dict]) -> dict:
+        """Return object selected properties and selected children."""
+        status, status_time = self.protocols.get(path, (None, 0.0))
+        if status and time.time() >= status_time:
+            self.objects[path]["status"] = status
+        node = {k: v for k, v in self.objects[path].items() if "*" in properties or k in properties}
+        node["href"] = self.prefix + path
+        for child in children:
+            for child_path in self.objects:
+                match = re.fullmatch(rf"{re.escape(path)}/(\w+)/\d+", child_path)
+                if match and re.search(child["child"], match.group(1)):
+                    child_node = self._select_node(child_path, child["properties"], children)
+                    node.setdefault(match.group(1), []).append(child_node)
+        return node
+
+    def _update_traffic_state(self) -> None:
+        """Stop traffic once traffic_duration expired and the started state was reported at least once."""
+        traffic = self.objects["ixnetwork/traffic"]
+        if traffic["state"] == "started" and traffic.get("reported") and time.time() >= self.traffic_stop_time:
+            traffic["state"] = "stopped"
+        traffic["reported"] = traffic["state"] == "started"
+
+    def _get_page(self, path: str) -> dict:
+        """Return current page of statistics view."""
+        view = self.objects[path.rsplit("/", maxsplit=1)[0]]["caption"]
+        page = self.pages.setdefault(path, {"pageSize": 50, "currentPage": 1})
+        captions, total_rows, row = self._view(view)
+        page_size, current_page = int(page["pageSize"]), int(page["currentPage"])
+        first = (current_page - 1) * page_size
+        rows = [[row(index)] for index in range(first, min(first + page_size, total_rows))]
+        return {
+            **page,
+            "isReady": True,
+            "columnCaptions": captions,
+            "totalRows": total_rows,
+            "totalPages": max(1, math.ceil(total_rows / page_size)),
+            "pageValues": rows,
+        }
+
+    def _view(self, view: str) -> Tuple[List[str], int, Callable[[int], List[str]]]:
+        """Return view captions, number of rows and function that returns row by index."""
+        vports = [self.objects[p]["name"] for p in self._children("ixnetwork/vport")]
+        items = [self.objects[p]["name"] for p in self._children("ixnetwork/traffic/trafficItem")]
+        frames = self.traffic_samples * 1000
+
+        def _counters(index: int) -> List[str]:
+            return [str(frames + index), str(frames + index), "0", "0.000", "100.000", "100.000"]
+
+        if view == "Port Statistics":
+            return (
+                PORT_CAPTIONS,
+                len(vports),
+                lambda i: [f"chassis/Card01/Port{i + 1:02}", vports[i], "10GE", "Up", *_counters(i)[:4]],
+            )
+        if view == "Traffic Item Statistics":
+            return TRAFFIC_ITEM_CAPTIONS, len(items), lambda i: [items[i], *_counters(i)]
+        flows = self.server.flow_rows if items and vports else 0
+        return (
+            FLOW_CAPTIONS,
+            flows,
+            lambda i: [
+                vports[i % len(vports)],
+                vports[(i + 1) % len(vports)],
+                items[i % len(items)],
+                f"Flow {i}",
+                *_counters(i),
+            ],
+        )
+
+
+class _IxnMockRequestHandler(BaseHTTPRequestHandler):
+    """Dispatch HTTP requests to the mock server sessions."""
+
+    server: "_IxnMockHttpServer"
+
+    def do_GET(self) -> None:  # noqa: N802 pylint: disable=invalid-name
+        """Handle GET request."""
+        self._handle("get")
+
+    def do_POST(self) -> None:  # noqa: N802 pylint: disable=invalid-name
+        """Handle POST request."""
+        self._handle("post")
+
+    def do_PATCH(self) -> None:  # noqa: N802 pylint: disable=invalid-name
+        """Handle PATCH request."""
+        self._handle("patch")
+
+    def do_DELETE(self) -> None:  # noqa: N802 pylint: disable=invalid-name
+        """Handle DELETE request."""
+        self._handle("delete")
+
+    def do_OPTIONS(self) -> None:  # noqa: N802 pylint: disable=invalid-name
+        """Handle OPTIONS request."""
+        self._handle("options")
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 pylint: disable=redefined-builtin
+        """Do not log requests to stderr."""
+
+    def _handle(self, method: str) -> None:
+        mock = self.server.mock
+        time.sleep(mock.latency)
+        url = urlparse(self.path)
+        path = url.path.rstrip("/")
+        length = int(self.headers.get("content-length", 0))
+        body = self.rfile.read(length) if length else b""
+        mock.count(method, path, len(body))
+        status, response = mock.handle(method, path, parse_qs(url.query), body)
+        content = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class _IxnMockHttpServer(ThreadingHTTPServer):
+    """HTTP server with reference to the mock server."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, mock: "IxnMockServer", host: str) -> None:
+        """Bind to any free port on host."""
+        super().__init__((host, 0), _IxnMockRequestHandler)
+        self.mock = mock
+
+
+# pylint: disable=too-many-instance-attributes
+class IxnMockServer:
+    """Local stand-in for IxNetwork API server.
+
+    Usage:
+        with IxnMockServer(latency=0.01, ports=8, flow_rows=10_000) as server:
+            ixn.connect(server.host, server.port)
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        latency: float = 0.0,
+        ports: int = 4,
+        traffic_items: int = 4,
+        flow_rows: int = 1000,
+        traffic_duration: float = 0.0,
+        protocols_duration: float = 0.0,
+        async_operations: bool = False,
+        host: str = "127.0.0.1",
+    ) -> None:
+        """Create server, the server starts listening on start.
+
+        :param latency: Delay (seconds) before handling each request.
+        :param ports: Number of vports in the loaded configuration.
+        :param traffic_items: Number of traffic items in the loaded configuration.
+        :param flow_rows: Number of rows in Flow Statistics view.
+        :param traffic_duration: How long (seconds) traffic runs before it stops by itself.
+        :param protocols_duration: How long (seconds) topologies and device groups take to start/stop.
+        :param async_operations: Report each operation in progress once, completed on the first progress request.
+        :param host: Listening interface.
+        """
+        self.latency = latency
+        self.ports = ports
+        self.traffic_items = traffic_items
+        self.flow_rows = flow_rows
+        self.traffic_duration = traffic_duration
+        self.protocols_duration = protocols_duration
+        self.async_operations = async_operations
+        self.host = host
+        self.sessions: Dict[int, IxnMockSession] = {}
+        self.requests: Counter = Counter()
+        self.uploaded_bytes = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._http_server: Optional[_IxnMockHttpServer] = None
+
+    def __enter__(self) -> "IxnMockServer":
+        """Start server."""
+        self.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Stop server."""
+        self.stop()
+
+    @property
+    def port(self) -> int:
+        """Listening TCP port."""
+        return self._http_server.server_address[1]
+
+    def start(self) -> None:
+        """Start listening on a free TCP port in background thread."""
+        self._http_server = _IxnMockHttpServer(self, self.host)
+        threading.Thread(target=self._http_server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop listening."""
+        self._http_server.shutdown()
+        self._http_server.server_close()
+
+    def count(self, method: str, path: str, size: int) -> None:
+        """Count request by method and path pattern (object ids replaced by N)."""
+        with self._lock:
+            self.requests[f"{method.upper()} {re.sub(r'/[0-9]+', '/N', path)}"] += 1
+            if method == "post" and path.endswith("ixnetwork/files"):
+                self.uploaded_bytes += size
+
+    def iter_requests(self) -> Iterator[Tuple[str, int]]:
+        """Yield (request pattern, count) for all requests, most frequent first."""
+        yield from self.requests.most_common()
+
+    def handle(  # pylint: disable=too-many-return-statements
+        self, method: str, path: str, params: dict, body: bytes
+    ) -> Tuple[int, object]:
+        """Route request to sessions list or to session."""
+        if path == SESSIONS_URL:
+            if method == "post":
+                with self._lock:
+                    session = IxnMockSession(self, next(self._ids))
+                    self.sessions[session.id] = session
+                return 201, {"id": session.id, "links": [{"href": f"{SESSIONS_URL}/{session.id}"}]}
+            return 200, [{"id": session_id} for session_id in self.sessions]
+        match = re.fullmatch(rf"{SESSIONS_URL}/(\d+)/?(.*)", path)
+        session = self.sessions.get(int(match.group(1))) if match else None
+        if not session:
+            return 404, {"errors": [f"{path} not found"]}
+        if not match.group(2) and method == "delete":
+            del self.sessions[session.id]
+            return 200, {}
+        if method == "post" and path.endswith("ixnetwork/files"):
+            session.files[params["filename"][0]] = len(body)
+        if method == "delete" and path.endswith("ixnetwork/files"):
+            if not session.files.pop(params["filename"][0], None):
+                return 404, {"errors": [f"{params['filename'][0]} not found"]}
+            return 200, {}
+        if method in ["post", "patch"]:
+            # Uploaded files are not JSON and not stored.
+            data = json.loads(body) if body and not path.endswith("ixnetwork/files") else {}
+            return getattr(session, method)(match.group(2), data)
+        return getattr(session, method)(match.group(2))
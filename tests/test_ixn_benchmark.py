@@ -0,0 +1,594 @@
+"""
+Benchmark IxNetwork controller shell commands against mock IxNetwork REST server - no CloudShell or IxNetwork required.
+
+Save a baseline with `pytest tests/test_ixn_benchmark.py --benchmark-autosave` and compare following runs against it with
+`--benchmark-compare --benchmark-compare-fail=mean:20%`.
+The number of REST requests of each command is asserted against REST_REQUESTS_BUDGET regardless of pytest-benchmark.
+"""
+# pylint: disable=redefined-outer-name
+import csv
+import gzip
+import io
+import json
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Tuple
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from ixn_mock_server import IxnMockServer, IxnMockSession
+from ixnetwork.ixn_app import IxnApp
+from trafficgenerator.tgn_utils import TgnError
+
+from src import ixn_handler
+from src.ixn_handler import IxnHandler
+from src.ixn_statistics import STATISTICS_PAGE_SIZE
+from src.ixn_utils import run_concurrently
+
+pytest.importorskip("pytest_benchmark")
+
+MOCK_LATENCY = 0.0
+PORTS = 8
+CHASSIS = "192.168.0.1"
+CONFIG_FILE = Path(__file__).parent.joinpath("test_config_classic.ixncfg")
+
+# Max REST requests per command call with PORTS ports, excluding first call objects discovery.
+# get_statistics budget is per view plus 2 requests per page.
+REST_REQUESTS_BUDGET = {
+    "load_config": 72,
+    "start_traffic": 24,
+    "get_statistics": 5,
+    "cleanup": 36,
+}
+
+logger = logging.getLogger("tgn.ixnetwork")
+
+
+@pytest.fixture(scope="module")
+def server() -> Iterable[IxnMockServer]:
+    """Yield running mock IxNetwork REST server."""
+    with IxnMockServer(latency=MOCK_LATENCY, ports=PORTS) as server:
+        yield server
+
+
+@pytest.fixture()
+def handler(server: IxnMockServer, monkeypatch: MonkeyPatch) -> Iterable[IxnHandler]:
+    """Yield handler connected to the mock server, CloudShell API calls are replaced with in-memory reservation."""
+    reservation_ports = {
+        f"Port {index}": SimpleNamespace(Name=f"{CHASSIS}/Module1/Port{index}", FullAddress=f"{CHASSIS}/M1/P{index}")
+        for index in range(1, PORTS + 1)
+    }
+    monkeypatch.setattr(IxnHandler, "_get_reservation_ports", lambda self, context: reservation_ports)
+    monkeypatch.setattr(ixn_handler, "attach_stats_csv", lambda *args: None)
+    handler = IxnHandler()
+    handler.initialize(_context(server), logger)  # type: ignore[arg-type]
+    yield handler
+    handler.cleanup()
+
+
+def _context(
+    server: IxnMockServer, lazy_connect: str = "False", name: str = "IxNetwork Controller", coordinated_controllers: str = ""
+) -> SimpleNamespace:
+    """Return minimal driver context with the controller resource attributes."""
+    attributes = {
+        "IxNetwork Controller Shell 2G.Address": server.host,
+        "IxNetwork Controller Shell 2G.Controller TCP Port": str(server.port),
+        "IxNetwork Controller Shell 2G.Lazy Connect": lazy_connect,
+        "IxNetwork Controller Shell 2G.Coordinated Controllers": coordinated_controllers,
+    }
+    return SimpleNamespace(resource=SimpleNamespace(name=name, attributes=attributes))
+
+
+def _session(server: IxnMockServer, handler: IxnHandler) -> IxnMockSession:
+    """Return the mock server session of the handler."""
+    return server.sessions[int(handler.get_session_id().split("/")[-2])]
+
+
+def _run(benchmark: object, handler: IxnHandler, command: str, *args: object, **kwargs: object) -> Tuple[Any, int]:
+    """Benchmark handler command and return the command result and average REST requests per benchmarked call."""
+    before = handler.metrics.to_dict().get(command, {"count": 0, "rest_requests": 0})
+    result = benchmark.pedantic(getattr(handler, command), args=args, **kwargs)  # type: ignore[attr-defined]
+    after = handler.metrics.to_dict()[command]
+    return result, (after["rest_requests"] - before["rest_requests"]) // (after["count"] - before["count"])
+
+
+@pytest.mark.parametrize("lazy_connect", ["False", "True"])
+def test_initialize(benchmark: object, server: IxnMockServer, lazy_connect: str) -> None:
+    """Benchmark driver initialization with and without lazy connect."""
+    handlers = []
+
+    def _initialize() -> None:
+        handler = IxnHandler()
+        handler.initialize(_context(server, lazy_connect), logger)  # type: ignore[arg-type]
+        handlers.append(handler)
+
+    benchmark.pedantic(_initialize, rounds=10)  # type: ignore[attr-defined]
+    for handler in handlers:
+        handler.cleanup()
+
+
+def test_lazy_connect() -> None:
+    """Test that lazy connect opens a single session on the first command, even with concurrent first commands."""
+    with IxnMockServer(latency=0.05) as server:
+        handler = IxnHandler()
+        handler.initialize(_context(server, "True"), logger)  # type: ignore[arg-type]
+        assert not server.sessions
+        results = run_concurrently(handler.get_session_id, {str(index): () for index in range(8)}, timeout=10)
+        assert all(result.ok for result in results.values())
+        assert len({result.result for result in results.values()}) == 1
+        assert len(server.sessions) == 1
+        handler.cleanup()
+
+
+def test_load_config(benchmark: object, handler: IxnHandler) -> None:
+    """Benchmark load configuration, map and reserve ports."""
+
+    def _setup() -> None:
+        handler.config_hash = None
+
+    _, rest_requests = _run(benchmark, handler, "load_config", None, CONFIG_FILE.as_posix(), setup=_setup, rounds=10)
+    assert rest_requests <= REST_REQUESTS_BUDGET["load_config"]
+
+
+def test_get_reservation_ports(monkeypatch: MonkeyPatch) -> None:
+    """Test that ports logical names are read with one GetResourceDetails call per chassis, with per port fallback."""
+    ports = [SimpleNamespace(Name=f"{CHASSIS}/Module1/Port{index}") for index in range(1, 4)]
+    port_resources = [
+        SimpleNamespace(
+            Name=port.Name,
+            ResourceAttributes=[SimpleNamespace(Name="Generic Traffic Generator Port.Logical Name", Value=f" Port {index} ")],
+            ChildResources=[],
+        )
+        for index, port in enumerate(ports[:2], start=1)
+    ]
+    module = SimpleNamespace(Name=f"{CHASSIS}/Module1", ResourceAttributes=[], ChildResources=port_resources)
+    chassis = SimpleNamespace(Name=CHASSIS, ResourceAttributes=[], ChildResources=[module])
+    calls: List[str] = []
+
+    def _get_resource_details(name: str) -> SimpleNamespace:
+        calls.append(name)
+        return chassis
+
+    def _get_family_attribute(_: object, name: str, *__: str) -> str:
+        calls.append(name)
+        return "Port 3"
+
+    cs_session = SimpleNamespace(GetResourceDetails=_get_resource_details)
+    monkeypatch.setattr(ixn_handler, "get_resources_from_reservation", lambda context, *models: ports)
+    monkeypatch.setattr(ixn_handler, "get_cs_session", lambda context: cs_session)
+    monkeypatch.setattr(ixn_handler, "get_family_attribute", _get_family_attribute)
+
+    reservation_ports = IxnHandler()._get_reservation_ports(None)  # pylint: disable=protected-access
+    assert reservation_ports == {"Port 1": ports[0], "Port 2": ports[1], "Port 3": ports[2]}
+    assert calls == [CHASSIS, ports[2].Name]
+
+
+def test_load_config_root_lock(handler: IxnHandler, monkeypatch: MonkeyPatch) -> None:
+    """Test that load config waits for ports link up without holding the process wide root lock."""
+    locked = []
+    get_poll_scheduler = ixn_handler.get_poll_scheduler
+
+    def _wait(name: str, *args: object) -> int:
+        if name == "port_up":
+            acquired = ixn_handler.ROOT_LOCK.acquire(blocking=False)
+            locked.append(not acquired)
+            if acquired:
+                ixn_handler.ROOT_LOCK.release()
+        return get_poll_scheduler("test").wait(name, *args)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(ixn_handler, "get_poll_scheduler", lambda _: SimpleNamespace(wait=_wait))
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    assert locked == [False] * PORTS
+    assert all(port.get_attribute("state") == "up" for port in handler.ixn.root.ports.values())
+
+
+def test_connect_root_lock(server: IxnMockServer, monkeypatch: MonkeyPatch) -> None:
+    """Test that connect writes the process wide pyixnetwork root under the root lock."""
+    locked = []
+    connect = IxnApp.connect
+
+    def _is_locked() -> bool:
+        acquired = ixn_handler.ROOT_LOCK.acquire(blocking=False)
+        if acquired:
+            ixn_handler.ROOT_LOCK.release()
+        return not acquired
+
+    def _connect(ixn: IxnApp, **kwargs: object) -> None:
+        locked.append(run_concurrently(_is_locked, {"connect": ()}, timeout=1)["connect"].result)
+        connect(ixn, **kwargs)
+
+    monkeypatch.setattr(IxnApp, "connect", _connect)
+    handler = IxnHandler()
+    handler.initialize(_context(server), logger)  # type: ignore[arg-type]
+    handler.cleanup()
+    assert locked == [True]
+
+
+def test_config_upload_cache(server: IxnMockServer, handler: IxnHandler, monkeypatch: MonkeyPatch) -> None:
+    """Test that configuration files are uploaded once per session by content, within the uploads size budget."""
+    other_config_file = CONFIG_FILE.with_name("test_config_ngpf.ixncfg")
+    monkeypatch.setattr(ixn_handler, "CONFIG_UPLOADS_MAX_BYTES", CONFIG_FILE.stat().st_size + other_config_file.stat().st_size)
+    session = _session(server, handler)
+
+    def _load_config(config_file: Path) -> int:
+        """Load configuration and return number of uploaded bytes."""
+        uploaded_bytes = server.uploaded_bytes
+        handler.config_hash = None
+        handler.load_config(None, config_file.as_posix())
+        return server.uploaded_bytes - uploaded_bytes
+
+    assert _load_config(CONFIG_FILE) == CONFIG_FILE.stat().st_size
+    assert _load_config(CONFIG_FILE) == 0
+    assert _load_config(other_config_file) == other_config_file.stat().st_size
+    assert _load_config(CONFIG_FILE) == 0
+    assert len(session.files) == 2
+
+    session.files.clear()
+    assert _load_config(CONFIG_FILE) == CONFIG_FILE.stat().st_size
+
+    assert _load_config(CONFIG_FILE.with_name("quick_test_classic.ixncfg")) > 0
+    assert sorted(name.split("-", 1)[1] for name in session.files) == ["quick_test_classic.ixncfg", CONFIG_FILE.name]
+    assert _load_config(other_config_file) == other_config_file.stat().st_size
+    assert [name.split("-", 1)[1] for name in session.files] == [other_config_file.name]
+
+
+def test_load_config_skip(server: IxnMockServer, handler: IxnHandler, monkeypatch: MonkeyPatch) -> None:
+    """Test load of the loaded configuration and of configuration changed by set attribute(s) and quick test commands.
+
+    Load of the loaded configuration skips the reload and re-reserves only ports mapped to new locations, commands that
+    change the configuration force the next load to reload the file.
+    """
+    reservation_ports = handler._get_reservation_ports(None)  # pylint: disable=protected-access
+    reserve_ports = handler._reserve_ports  # pylint: disable=protected-access
+    reserved: List[List[str]] = []
+
+    def _reserve_ports(ports: Dict[str, Tuple[object, str]]) -> None:
+        reserved.append(sorted(ports))
+        reserve_ports(ports)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(handler, "_reserve_ports", _reserve_ports)
+    monkeypatch.setattr(handler, "_get_reservation_ports", lambda context: reservation_ports)
+
+    def _load_config() -> int:
+        """Load configuration and return number of loadconfig operations."""
+        loads = server.requests["POST /api/v1/sessions/N/ixnetwork/operations/loadconfig"]
+        reserved.clear()
+        handler.load_config(None, CONFIG_FILE.as_posix())
+        return server.requests["POST /api/v1/sessions/N/ixnetwork/operations/loadconfig"] - loads
+
+    assert _load_config() == 1
+    assert len(reserved[0]) == PORTS
+    assert _load_config() == 0
+    assert reserved == [[]]
+
+    reservation_ports = dict(
+        reservation_ports, **{"Port 1": reservation_ports["Port 2"], "Port 2": reservation_ports["Port 1"]}
+    )
+    assert _load_config() == 0
+    assert reserved == [["Port 1", "Port 2"]]
+
+    port_ref = handler.ixn.root.ports["Port 1"].ref
+    handler.set_attribute(port_ref, "rxMode", "capture")
+    assert _load_config() == 1
+    assert len(reserved[0]) == PORTS
+    handler.set_attributes_bulk(json.dumps([[port_ref, {"rxMode": "capture"}]]))
+    assert _load_config() == 1
+
+    handler.start_quick_test("RFC 2544")
+    assert _load_config() == 1
+
+
+def test_run_quick_tests(server: IxnMockServer, handler: IxnHandler, monkeypatch: MonkeyPatch) -> None:
+    """Test run_quick_tests summary and that quick tests are applied again only after configuration changes."""
+    attached: List[str] = []
+
+    def _attach_stats_csv(*args: object, **_: object) -> object:
+        attached.append(str(args[2]))
+        return args[2]
+
+    monkeypatch.setattr("ixn_quick_tests.attach_stats_csv", _attach_stats_csv)
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    apply = "POST /api/v1/sessions/N/ixnetwork/quickTest/rfc2544throughput/operations/apply"
+    applies = server.requests[apply]
+
+    summary = list(csv.reader(io.StringIO(handler.run_quick_tests(None, "RFC 2544, RFC 2544"))))
+    assert summary[0] == ["Test", "status", "progress", "result", "duration", "Report"]
+    assert summary[1:] == [["RFC 2544", "Test complete", "", "pass", "00:00:01", "RFC 2544"]] * 2
+    assert attached == ["RFC 2544", "RFC 2544", "quick_tests_summary"]
+    assert server.requests[apply] - applies == 1
+    handler.run_quick_test(None, "RFC 2544")
+    assert server.requests[apply] - applies == 1
+
+    handler.set_attribute(handler.ixn.root.ports["Port 1"].ref, "rxMode", "capture")
+    handler.run_quick_tests(None, "RFC 2544")
+    assert server.requests[apply] - applies == 2
+    with pytest.raises(TgnError):
+        handler.run_quick_tests(None, "RFC 2544, RFC 2889")
+
+
+def test_protocols_scoped(server: IxnMockServer, handler: IxnHandler, monkeypatch: MonkeyPatch) -> None:
+    """Test scoped start/stop protocols - one operation per objects type and one status request per poll."""
+    monkeypatch.setattr(server, "protocols_duration", 0.2)
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    session = _session(server, handler)
+    requests = server.requests.copy()
+
+    summary = handler.start_protocols_scoped("Topology 1, Device Group 2, Port 5, Device Group 1", "10")
+    assert sorted(s["name"] for s in summary.values()) == ["Device Group 2", "Topology 1", "Topology 3"]
+    assert all(s["status"] == "started" and s["seconds"] >= 0.2 for s in summary.values())
+    assert sorted(session.protocols) == [
+        "ixnetwork/topology/1",
+        "ixnetwork/topology/1/deviceGroup/1",
+        "ixnetwork/topology/2/deviceGroup/1",
+        "ixnetwork/topology/3",
+        "ixnetwork/topology/3/deviceGroup/1",
+    ]
+    operations = server.requests - requests
+    assert operations["POST /api/v1/sessions/N/ixnetwork/topology/operations/start"] == 1
+    assert operations["POST /api/v1/sessions/N/ixnetwork/topology/deviceGroup/operations/start"] == 1
+    assert operations["POST /api/v1/sessions/N/ixnetwork/operations/select"] <= 3
+
+    summary = handler.stop_protocols_scoped("Port 1", "10")
+    assert [s["status"] for s in summary.values()] == ["notStarted"]
+    monkeypatch.setattr(server, "protocols_duration", 10)
+    with pytest.raises(TgnError):
+        handler.stop_protocols_scoped("Topology 3", "0.2")
+    with pytest.raises(TgnError):
+        handler.start_protocols_scoped("Topology 1, No Such Topology", "10")
+
+
+def test_nested_waits(server: IxnMockServer, handler: IxnHandler, monkeypatch: MonkeyPatch) -> None:
+    """Test polls that wait for non-blocking operations on all ports together - polls never block nested waits."""
+    monkeypatch.setattr(server, "async_operations", True)
+    monkeypatch.setattr(ixn_handler, "RELEASE_PORTS_TIMEOUT", 10)
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    summary = handler.start_protocols_scoped(", ".join(f"Port {index}" for index in range(1, PORTS + 1)), "10")
+    assert all(s["status"] == "started" for s in summary.values())
+    handler.cleanup()
+    polls = handler.metrics.to_dict()["cleanup"]["polls"]
+    assert polls.get("port_released") == PORTS
+    assert polls["operation"] >= PORTS
+    assert handler.metrics.to_dict()["cleanup"]["max"] < ixn_handler.RELEASE_PORTS_TIMEOUT
+
+
+@pytest.mark.parametrize("output_type", ["JSON", "CSV"])
+@pytest.mark.parametrize("rows", [1_000, 10_000, 100_000])
+def test_get_statistics(benchmark: object, server: IxnMockServer, handler: IxnHandler, rows: int, output_type: str) -> None:
+    """Benchmark get Flow Statistics view."""
+    server.flow_rows = rows
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    args = (None, "Flow Statistics", output_type, None, "False")
+    handler.get_statistics(*args)
+    statistics, rest_requests = _run(benchmark, handler, "get_statistics", *args, rounds=3)
+    assert len(statistics) == rows if output_type == "JSON" else statistics.count("\n") == rows
+    assert rest_requests <= REST_REQUESTS_BUDGET["get_statistics"] + 2 * rows // STATISTICS_PAGE_SIZE
+
+
+@pytest.mark.parametrize("output_type", ["JSON", "CSV"])
+def test_get_statistics_query(benchmark: object, server: IxnMockServer, handler: IxnHandler, output_type: str) -> None:
+    """Benchmark get Flow Statistics view slice - few columns of the rows that match the filters."""
+    server.flow_rows = 100_000
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    key_filter = r"Traffic Item 2/Flow [0-9]*1$"
+    full_view = handler.get_statistics(None, "Flow Statistics", "JSON", None, "False")
+    expected = {
+        key: {"Rx Frames": row["Rx Frames"], "Tx Frames": row["Tx Frames"]}
+        for key, row in full_view.items()  # type: ignore[union-attr]
+        if re.search(key_filter, key) and int(row["Tx Frames"]) < 10_000
+    }
+    assert expected
+
+    args = (None, "Flow Statistics", output_type, None, "False", "Tx Frames, Rx Frames", key_filter, "Tx Frames < 10000")
+    statistics, _ = _run(benchmark, handler, "get_statistics", *args, rounds=3)
+    if output_type == "JSON":
+        assert statistics == expected
+    else:
+        assert statistics.startswith("Tx Frames,Rx Frames\r\n")
+        assert statistics.count("\n") == len(expected)
+
+    statistics = handler.get_statistics(None, "Port Statistics", "JSON", None, "True", "Frames Tx. Rate", "Port 1$", None)
+    assert statistics == {"Port 1": {"Frames Tx. Rate": ""}}
+    with pytest.raises(TgnError):
+        handler.get_statistics(None, "Port Statistics", "JSON", None, "False", "Frames Tx., No Such Column", None, None)
+
+
+@pytest.mark.parametrize("rows", [1_000, 100_000])
+def test_get_traffic_verdict(benchmark: object, server: IxnMockServer, handler: IxnHandler, rows: int) -> None:
+    """Benchmark traffic verdict over Flow Statistics view and test thresholds evaluation."""
+    server.flow_rows = rows
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    thresholds = {"loss": "0", "rx_rate": "100"}
+    verdict, _ = _run(benchmark, handler, "get_traffic_verdict", "Flow Statistics", thresholds, rounds=3)
+    assert verdict == {"verdict": "PASS", "rows": rows, "worst": {"loss": 0.0, "rx_rate": 100.0}, "failures": {}}
+
+    verdict = handler.get_traffic_verdict("Traffic Item Statistics", {"loss": "0", "rx_rate": "150", "avg_latency": None})
+    assert verdict["verdict"] == "FAIL"
+    assert verdict["rows"] == len(verdict["failures"]) == 4
+    assert all(failure == {"Rx Frame Rate": "100.000"} for failure in verdict["failures"].values())
+    with pytest.raises(TgnError):
+        handler.get_traffic_verdict("Traffic Item Statistics", {"avg_latency": "1000"})
+
+
+def test_statistics_view_resolve(server: IxnMockServer, handler: IxnHandler) -> None:
+    """Test that readers of missing views are not cached and stale views are re-resolved."""
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    session = _session(server, handler)
+    args = (None, "Flow Statistics", "JSON", None, "False")
+
+    def _recreate_view() -> None:
+        session.delete(next(path for path, obj in session.objects.items() if obj.get("caption") == "Flow Statistics"))
+        session.post("ixnetwork/statistics/view", {"caption": "Flow Statistics", "visible": True})
+
+    session.delete(next(path for path, obj in session.objects.items() if obj.get("caption") == "Flow Statistics"))
+    with pytest.raises(TgnError):
+        handler.get_statistics(*args)
+    assert not handler.statistics_readers
+    session.post("ixnetwork/statistics/view", {"caption": "Flow Statistics", "visible": True})
+    assert len(handler.get_statistics(*args)) == server.flow_rows
+    _recreate_view()
+    assert len(handler.get_statistics(*args)) == server.flow_rows
+    assert handler.get_traffic_verdict("Flow Statistics", {"loss": "0"})["verdict"] == "PASS"
+
+    # Invalid queries fail on the first page without re-resolving the view, unknown thresholds before any request.
+    reader, requests = handler.statistics_readers[("Flow Statistics", None)], server.requests.copy()
+    with pytest.raises(TgnError):
+        handler.get_statistics(*args, "Tx Frames, No Such Column", None, None)
+    with pytest.raises(TgnError):
+        handler.get_statistics(*args, None, None, "Tx Frames >> 0")
+    assert handler.statistics_readers[("Flow Statistics", None)] is reader
+    assert all(request.endswith("/statistics/view/N/page") for request in server.requests - requests)
+    requests = server.requests.copy()
+    with pytest.raises(TgnError):
+        handler.get_traffic_verdict("Flow Statistics", {"loss": "0", "jitter": "1"})
+    assert server.requests == requests
+    handler.start_traffic(None, "True", "True")
+    assert not handler.statistics_readers
+
+
+def test_stats_recording_view_resolve(server: IxnMockServer, handler: IxnHandler, monkeypatch: MonkeyPatch) -> None:
+    """Test that statistics recording keeps sampling views re-created by IxNetwork or re-resolved after traffic apply."""
+    monkeypatch.setattr(server, "flow_rows", 10)
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    session = _session(server, handler)
+    attached = []
+    monkeypatch.setattr(ixn_handler, "attach_stats_csv", lambda *args, **kwargs: attached.append(args[3]))
+    handler.start_stats_recording("Flow Statistics", "0.05")
+    recorder = handler.statistics_recorder
+    time.sleep(0.2)
+    session.delete(next(path for path, obj in session.objects.items() if obj.get("caption") == "Flow Statistics"))
+    session.post("ixnetwork/statistics/view", {"caption": "Flow Statistics", "visible": True})
+    handler.start_traffic(None, "False", "True")
+    time.sleep(0.2)
+    handler.stop_stats_recording(None)
+
+    rows = list(csv.reader(io.StringIO(gzip.decompress(attached[0]).decode())))
+    assert len(rows) == 1 + server.flow_rows * recorder.samples
+    assert len({row[0] for row in rows[1:]}) == recorder.samples
+
+
+def test_start_traffic(benchmark: object, handler: IxnHandler) -> None:
+    """Benchmark blocking start traffic, with regenerate and apply."""
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    handler.start_traffic(None, "True", "True")
+    _, rest_requests = _run(benchmark, handler, "start_traffic", None, "True", "True", rounds=5)
+    assert rest_requests <= REST_REQUESTS_BUDGET["start_traffic"]
+    metrics = handler.metrics.to_dict()["start_traffic"]
+    assert metrics["polls"] == {"traffic_started": metrics["count"], "traffic_stopped": metrics["count"]}
+
+
+def test_start_traffic_applied(server: IxnMockServer, handler: IxnHandler) -> None:
+    """Test that start traffic regenerates and applies traffic only if forced or the configuration might have changed."""
+    handler.load_config(None, CONFIG_FILE.as_posix())
+
+    def _start_traffic(force_regenerate: str) -> int:
+        """Start traffic and return number of generate and apply operations."""
+        requests = server.requests.copy()
+        handler.start_traffic(None, "True", force_regenerate)
+        operations = server.requests - requests
+        return sum(count for request, count in operations.items() if re.search("operations/(generate|apply)$", request))
+
+    assert _start_traffic("False") == 2
+    assert _start_traffic("False") == 0
+    assert _start_traffic("True") == 2
+    handler.set_attribute(handler.ixn.root.ports["Port 1"].ref, "rxMode", "capture")
+    assert _start_traffic("False") == 2
+
+
+def test_cleanup(benchmark: object, handler: IxnHandler) -> None:
+    """Benchmark release all ports and disconnect, the handler reconnects on the next command after cleanup."""
+
+    def _setup() -> None:
+        handler.load_config(None, CONFIG_FILE.as_posix())
+
+    _, rest_requests = _run(benchmark, handler, "cleanup", setup=_setup, rounds=5)
+    assert rest_requests <= REST_REQUESTS_BUDGET["cleanup"]
+    assert handler.ixn.root
+
+
+def test_cleanup_unreleased_ports(handler: IxnHandler, monkeypatch: MonkeyPatch) -> None:
+    """Test that cleanup force clears ownership of ports that were not released and always disconnects."""
+    handler.load_config(None, CONFIG_FILE.as_posix())
+    ixn = handler.ixn
+    execute = ixn.api.execute
+    cleared: List[str] = []
+
+    def _execute(operation: str, *args: str) -> object:
+        if operation == "clearOwnership":
+            cleared.append(args[0])
+            return None
+        return execute(operation, *args)
+
+    def _release_port(port: object, *_: object) -> None:
+        if port.name in ["Port 1", "Port 2"]:  # type: ignore[attr-defined]
+            raise TgnError(f"Port {port} not released")
+
+    monkeypatch.setattr(ixn.api, "execute", _execute)
+    monkeypatch.setattr(handler, "_release_port", _release_port)
+    connected_to = [ixn.root.ports[name].get_attribute("connectedTo") for name in ["Port 1", "Port 2"]]
+    handler.cleanup()
+    assert sorted(cleared) == sorted(connected_to)
+    assert ixn.root is None
+
+
+@pytest.mark.usefixtures("handler")
+def test_coordinator(benchmark: object, server: IxnMockServer, monkeypatch: MonkeyPatch) -> None:
+    """Benchmark coordinated start traffic on two controllers and test merged statistics."""
+    with IxnMockServer(latency=MOCK_LATENCY, ports=PORTS) as peer_server:
+        peer = IxnHandler()
+        peer.initialize(_context(peer_server, name="Peer"), logger)  # type: ignore[arg-type]
+        monkeypatch.setitem(ixn_handler.IxnCoordinator.controllers, "Peer", peer)
+        coordinator = IxnHandler()
+        coordinator.initialize(_context(server, name="Coordinator", coordinated_controllers="Peer"), logger)  # type: ignore
+        coordinator.load_config(None, CONFIG_FILE.as_posix())
+        peer.load_config(None, CONFIG_FILE.as_posix())
+
+        _run(benchmark, coordinator, "start_traffic", None, "True", "True", rounds=5)
+        sessions = [_session(server, coordinator), _session(peer_server, peer)]
+        assert all(session.traffic_samples for session in sessions)
+        assert abs(sessions[0].traffic_stop_time - sessions[1].traffic_stop_time) < 0.5
+
+        statistics = coordinator.get_statistics(None, "Port Statistics", "JSON", None, "False")
+        assert len(statistics) == 2 * PORTS
+        assert {row["Controller"] for row in statistics.values()} == {"Coordinator", "Peer"}
+        assert all(key.startswith(f"{row['Controller']}/") for key, row in statistics.items())
+        statistics = coordinator.get_statistics(None, "Port Statistics", "CSV", None, "False")
+        assert statistics.startswith("Controller,")
+        assert statistics.count("\n") == 2 * PORTS
+
+        coordinator.stop_traffic(None)
+        assert all(session.objects["ixnetwork/traffic"]["state"] == "stopped" for session in sessions)
+        coordinator.cleanup()
+        peer.cleanup()
+
+
+@pytest.mark.usefixtures("handler")
+def test_coordinator_services(server: IxnMockServer, monkeypatch: MonkeyPatch) -> None:
+    """Test that coordinated controllers not running in this process are resolved from the reservation services."""
+    with IxnMockServer(latency=MOCK_LATENCY, ports=PORTS) as peer_server:
+        attributes = _context(peer_server, name="Peer").resource.attributes
+        service = SimpleNamespace(Alias="Peer", Attributes=[SimpleNamespace(Name=n, Value=v) for n, v in attributes.items()])
+        coordinator_module = sys.modules[ixn_handler.IxnCoordinator.__module__]
+        monkeypatch.setattr(coordinator_module, "get_reservation_description", lambda _: SimpleNamespace(Services=[service]))
+        coordinator = IxnHandler()
+        context = _context(server, name="Coordinator", coordinated_controllers="Peer")
+        coordinator.initialize(context, logger)  # type: ignore[arg-type]
+        with pytest.raises(TgnError):
+            coordinator.stop_traffic(None)
+
+        context.reservation = SimpleNamespace(reservation_id="reservation")
+        coordinator.stop_traffic(context)  # type: ignore[arg-type]
+        assert len(peer_server.sessions) == 1
+        monkeypatch.setattr(coordinator_module, "get_reservation_description", lambda _: SimpleNamespace(Services=[]))
+        coordinator.stop_traffic(context)  # type: ignore[arg-type]
+        assert list(coordinator.coordinator.owned_handlers) == ["Peer"]
+        coordinator.cleanup()
+        assert not coordinator.coordinator.owned_handlers
+
+        coordinator.initialize(context, logger)  # type: ignore[arg-type]
+        with pytest.raises(TgnError):
+            coordinator.stop_traffic(context)  # type: ignore[arg-type]
+        coordinator.cleanup()
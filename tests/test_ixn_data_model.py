@@ -0,0 +1,146 @@
+"""
+Test IxNetwork controller data model autoload hierarchy builder - no CloudShell or IxNetwork server required.
+"""
+# pylint: disable=redefined-outer-name
+import logging
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Any, Callable, List, Tuple
+
+import pytest
+from cloudshell.shell.core.driver_context import AutoLoadAttribute, AutoLoadDetails, AutoLoadResource
+
+from src.ixn_data_model import IxNetwork_Controller_Shell_2G, LegacyUtils
+
+MODEL = "IxNetwork_Controller_Shell_2G"
+
+logger = logging.getLogger("tgn.ixnetwork")
+
+
+@pytest.fixture(scope="module")
+def autoload_details() -> AutoLoadDetails:
+    """Yield synthetic 10k resources autoload details - 10 chassis x 100 modules x 10 ports."""
+    resources = []
+    attributes = []
+    for chassis in range(10):
+        for module in [None, *range(100)]:
+            for port in [None] if module is None else [None, *range(10)]:
+                address = "/".join(str(i) for i in [chassis, module, port] if i is not None)
+                resources.append(AutoLoadResource(model=MODEL, name=f"Resource {address}", relative_address=address))
+                attributes.append(AutoLoadAttribute(address, "Address", f"192.168.{address}"))
+    attributes.append(AutoLoadAttribute("", "Address", "192.168.0.1"))
+    return AutoLoadDetails(resources, attributes)
+
+
+def _legacy_migrate_autoload_details(autoload_details: AutoLoadDetails, context: SimpleNamespace) -> object:
+    """Original recursive LegacyUtils.migrate_autoload_details that scans the whole rank for every parent."""
+    classes = LegacyUtils.generate_datamodel_classes_dict()
+    attributes = defaultdict(list)
+    for attribute in autoload_details.attributes:
+        attributes[attribute.relative_address].append(attribute)
+
+    def _attach_attributes(relative_address: str, resource: object) -> None:
+        for attribute in attributes[relative_address]:
+            setattr(resource, attribute.attribute_name.lower().replace(" ", "_"), attribute.attribute_value)
+        del attributes[relative_address]
+
+    ranks = defaultdict(list)
+    for resource in autoload_details.resources:
+        splitted = resource.relative_address.split("/")
+        parent = "" if len(splitted) == 1 else resource.relative_address.rsplit("/", 1)[0]
+        ranks[len(splitted)].append((parent, resource))
+
+    def _set_hierarchy(rank: int, manipulated_resource: object, relative_address: str) -> None:
+        for parent, resource in ranks[rank]:
+            if parent == relative_address:
+                sub_resource = classes[resource.model.replace(" ", "")](resource.name)
+                _attach_attributes(resource.relative_address, sub_resource)
+                path = resource.relative_address.rsplit("/", 1)[-1]
+                manipulated_resource.add_sub_resource(path, sub_resource)  # type: ignore[attr-defined]
+                _set_hierarchy(rank + 1, sub_resource, resource.relative_address)
+
+    root = classes[context.resource.model](context.resource.name)
+    _attach_attributes("", root)
+    _set_hierarchy(1, root, "")
+    return root
+
+
+def _legacy_create_autoload_details(model: IxNetwork_Controller_Shell_2G, relative_path: str = "") -> AutoLoadDetails:
+    """Original recursive create_autoload_details that merges the sub-trees autoload details at every level."""
+    resources = [
+        AutoLoadResource(model=model.resources[r].cloudshell_model_name, name=model.resources[r].name, relative_address=p)
+        for r, p in [(r, model._get_relative_path(r, relative_path)) for r in model.resources]  # pylint: disable=W0212
+    ]
+    attributes = [AutoLoadAttribute(relative_path, a, model.attributes[a]) for a in model.attributes]
+    autoload_details = AutoLoadDetails(resources, attributes)
+    for r in model.resources:
+        curr_path = relative_path + "/" + r if relative_path else r
+        autoload_details = model._merge_autoload_details(  # pylint: disable=protected-access
+            autoload_details, _legacy_create_autoload_details(model.resources[r], curr_path)
+        )
+    return autoload_details
+
+
+def _tree(model: IxNetwork_Controller_Shell_2G, relative_path: str = "") -> List[Tuple[str, str, dict]]:
+    """Return model tree as list of (relative path, name, attributes) in depth first order."""
+    tree = [(relative_path, model.name, model.attributes)]
+    for path, resource in model.resources.items():
+        tree.extend(_tree(resource, f"{relative_path}/{path}" if relative_path else path))
+    return tree
+
+
+def _details(autoload_details: AutoLoadDetails) -> Tuple[list, list]:
+    """Return autoload details as comparable lists."""
+    return (
+        [(r.model, r.name, r.relative_address) for r in autoload_details.resources],
+        [(a.relative_address, a.attribute_name, a.attribute_value) for a in autoload_details.attributes],
+    )
+
+
+def _measure(func: Callable, *args: object) -> Tuple[Any, float]:
+    """Return func result and duration."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def test_migrate_autoload_details(autoload_details: AutoLoadDetails) -> None:
+    """Test that the iterative builder returns the same tree as the recursive builder, durations are logged only."""
+    context = SimpleNamespace(resource=SimpleNamespace(model=MODEL, name="IxNetwork Controller"))
+    legacy, legacy_time = _measure(_legacy_migrate_autoload_details, autoload_details, context)
+    root, root_time = _measure(LegacyUtils().migrate_autoload_details, autoload_details, context)
+    logger.info(f"migrate {len(autoload_details.resources)} resources - legacy: {legacy_time:.3f}s, new: {root_time:.3f}s")
+    assert _tree(root) == _tree(legacy)
+    assert len(_tree(root)) == len(autoload_details.resources) + 1
+
+    legacy_details, legacy_time = _measure(_legacy_create_autoload_details, root)
+    details, details_time = _measure(root.create_autoload_details)
+    logger.info(f"create {len(details.resources)} resources - legacy: {legacy_time:.3f}s, new: {details_time:.3f}s")
+    assert _details(details) == _details(legacy_details)
+    assert len(details.attributes) == len(autoload_details.attributes)
+
+
+def test_create_from_context() -> None:
+    """Test that resources created from context share the cached attributes snapshot but can be changed independently."""
+    attributes = {
+        "IxNetwork Controller Shell 2G.Address": "192.168.0.1",
+        "IxNetwork Controller Shell 2G.Controller TCP Port": "11009",
+    }
+    context = SimpleNamespace(resource=SimpleNamespace(name="IxNetwork Controller", attributes=attributes))
+    resource = IxNetwork_Controller_Shell_2G.create_from_context(context)
+    assert resource.address == "192.168.0.1"
+    assert resource.controller_tcp_port == "11009"
+    assert resource.user is None
+    resource.address = "192.168.0.2"
+    resource.vendor = "Ixia"
+    assert resource.address == "192.168.0.2"
+    assert resource.vendor == "Ixia"
+    assert IxNetwork_Controller_Shell_2G.create_from_context(context).address == "192.168.0.1"
+
+    context.resource.attributes = {**attributes, "IxNetwork Controller Shell 2G.Address": "192.168.0.3"}
+    assert IxNetwork_Controller_Shell_2G.create_from_context(context).address == "192.168.0.3"
+
+    context.resource.model = MODEL
+    root = LegacyUtils().migrate_autoload_details(AutoLoadDetails([], [AutoLoadAttribute("", "Vendor", "Ixia")]), context)
+    assert root.vendor == "Ixia"
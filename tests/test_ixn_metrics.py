@@ -0,0 +1,87 @@
+"""
+Test IxNetwork controller shell performance metrics - no CloudShell or IxNetwork server required.
+"""
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.ixn_metrics import PerformanceMetrics, measured
+from src.ixn_utils import run_concurrently
+
+
+class _Api:  # pylint: disable=too-few-public-methods
+    """Minimal IxnRestWrapper replacement."""
+
+    def request(self, duration: float) -> float:
+        """Simulate REST request."""
+        time.sleep(duration)
+        return duration
+
+
+class _Handler:
+    """Minimal IxnHandler replacement."""
+
+    def __init__(self) -> None:
+        """Create metrics and wrap API requests."""
+        self.metrics = PerformanceMetrics()
+        self.api = _Api()
+        self.api.request = self.metrics.wrap_rest(self.api.request)  # type: ignore[assignment]
+
+    @measured
+    def load_config(self) -> None:
+        """Send requests from the command thread and from workers and call nested command."""
+        self.api.request(0.01)
+        run_concurrently(self.api.request, {str(i): (0.01,) for i in range(4)}, timeout=1)
+        with self.metrics.phase("chassis"):
+            time.sleep(0.02)
+        self.metrics.add_polls("port_up", 2)
+        self.send_arp()
+
+    @measured
+    def send_arp(self) -> None:
+        """Send single request."""
+        self.api.request(0)
+
+    @measured
+    def start_traffic(self) -> None:
+        """Fail."""
+        raise ValueError("failed")
+
+
+def test_performance_metrics(tmp_path: Path) -> None:
+    """Test commands counters, REST requests attribution (never to finished commands) and Prometheus export."""
+    handler = _Handler()
+    handler.api.request = handler.metrics.wrap_rest(handler.api.request)  # type: ignore[assignment]
+    handler.api.request(0)
+    for _ in range(3):
+        handler.load_config()
+    handler.send_arp()
+    with pytest.raises(ValueError):
+        handler.start_traffic()
+
+    metrics = handler.metrics.to_dict()
+    assert list(metrics) == ["load_config", "send_arp", "start_traffic"]
+    assert metrics["load_config"]["count"] == 3
+    assert metrics["load_config"]["rest_requests"] == 3 * 6
+    assert metrics["load_config"]["phases"]["chassis"] >= 3 * 0.02
+    assert metrics["load_config"]["polls"] == {"port_up": 6}
+    assert metrics["load_config"]["p50"] <= metrics["load_config"]["p99"] <= metrics["load_config"]["max"]
+    assert metrics["send_arp"]["count"] == 1
+    assert metrics["send_arp"]["rest_requests"] == 1
+    assert metrics["start_traffic"]["errors"] == 1
+
+    assert handler.metrics.active is None
+    thread = threading.Thread(target=handler.api.request, args=(0,))
+    thread.start()
+    thread.join()
+    assert handler.metrics.to_dict() == metrics
+
+    prometheus_file = tmp_path.joinpath("ixn.prom")
+    handler.metrics.write_prometheus(prometheus_file)
+    text = prometheus_file.read_text()
+    assert 'ixn_command_duration_seconds_count{command="load_config"} 3' in text
+    assert 'ixn_command_rest_requests_total{command="load_config"} 18' in text
+    assert 'ixn_command_polls_total{command="load_config",wait="port_up"} 6' in text
+    assert list(tmp_path.iterdir()) == [prometheus_file]
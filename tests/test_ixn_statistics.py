@@ -0,0 +1,308 @@
+"""
+Test IxNetwork controller statistics serialization - no CloudShell or IxNetwork server required.
+"""
+# pylint: disable=redefined-outer-name
+import csv
+import gzip
+import io
+import json
+import logging
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from trafficgenerator.tgn_utils import TgnError
+
+from src import ixn_statistics
+from src.ixn_statistics import (
+    IxnStatisticsReader,
+    IxnStatisticsRecorder,
+    IxnStatisticsTable,
+    iter_csv,
+    parse_conditions,
+    select_statistics,
+    statistics_to_json,
+)
+
+CAPTIONS = ["Tx Frames", "Rx Frames", "Frames Delta", "Loss %", "Tx Frame Rate", "Rx Frame Rate", "Avg Latency (ns)"]
+
+logger = logging.getLogger("tgn.ixnetwork")
+
+
+@pytest.fixture(scope="module")
+def view() -> Tuple[List[str], Dict[str, List[str]]]:
+    """Yield synthetic 100k rows flow statistics view - (captions, {row key: row values})."""
+    rows = OrderedDict()
+    for index in range(100_000):
+        rows[f"Port 1/Port 2/Traffic Item {index % 64}/Flow {index}"] = [str(index * n) for n in range(len(CAPTIONS))]
+    return CAPTIONS, rows
+
+
+def _legacy_json(statistics: Dict[str, Dict[str, str]]) -> dict:
+    """Original get_statistics JSON output."""
+    return json.loads(json.dumps(statistics, indent=4, sort_keys=True, ensure_ascii=False))
+
+
+def _legacy_csv(captions: List[str], statistics: Dict[str, Dict[str, str]]) -> str:
+    """Original get_statistics CSV output."""
+    output = io.StringIO()
+    csv_writer = csv.DictWriter(output, captions)
+    csv_writer.writeheader()
+    for obj_name in statistics:
+        csv_writer.writerow(statistics[obj_name])
+    output.getvalue().strip()
+    return output.getvalue().strip()
+
+
+def _measure(func: Callable, *args: object) -> Tuple[Any, float, int]:
+    """Return func result, duration and peak memory allocated while running func."""
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, duration, peak
+
+
+def test_json_benchmark(view: Tuple[List[str], Dict[str, List[str]]]) -> None:
+    """Test that JSON normalization returns the same output as the dumps/loads round trip with less memory.
+
+    Durations are logged only, wall clock comparisons are not reliable on shared CI runners.
+    """
+    captions, rows = view
+    statistics = OrderedDict((key, dict(zip(captions, row))) for key, row in rows.items())
+    legacy, legacy_duration, legacy_peak = _measure(_legacy_json, statistics)
+    new, new_duration, new_peak = _measure(statistics_to_json, statistics)
+    logger.info(f"JSON - legacy {legacy_duration:.2f}s/{legacy_peak >> 20}MB, new {new_duration:.2f}s/{new_peak >> 20}MB")
+    assert new == legacy
+    assert list(new) == list(legacy)
+    assert new_peak < legacy_peak
+
+
+def test_csv_benchmark(view: Tuple[List[str], Dict[str, List[str]]]) -> None:
+    """Test that the chunked CSV writer returns the same output as DictWriter with less memory, durations are logged only."""
+    captions, rows = view
+    statistics = OrderedDict((key, dict(zip(captions, row))) for key, row in rows.items())
+    legacy, legacy_duration, legacy_peak = _measure(_legacy_csv, captions, statistics)
+    new, new_duration, new_peak = _measure(lambda: "".join(iter_csv([captions, *rows.values()])))
+    logger.info(f"CSV - legacy {legacy_duration:.2f}s/{legacy_peak >> 20}MB, new {new_duration:.2f}s/{new_peak >> 20}MB")
+    assert new == legacy
+    assert new_peak < legacy_peak
+
+
+@pytest.mark.parametrize("num_rows", [0, 1, 999, 1000, 1001])
+def test_iter_csv_chunks(num_rows: int) -> None:
+    """Test CSV chunks boundaries."""
+    rows = [CAPTIONS] + [[str(n)] * len(CAPTIONS) for n in range(num_rows)]
+    chunks = list(iter_csv(rows))
+    assert len(chunks) == (len(rows) - 1) // 1000 + 1
+    assert "".join(chunks) == "\r\n".join(",".join(row) for row in rows)
+
+
+def test_statistics_table_benchmark(view: Tuple[List[str], Dict[str, List[str]]]) -> None:
+    """Test that the columnar table exports the same JSON/CSV as the dictionary table and holds less memory."""
+    captions, rows = view
+
+    def _fresh_rows() -> Iterator[Tuple[str, List[str]]]:
+        """Yield view rows with new strings, as decoded from REST responses."""
+        for key, row in rows.items():
+            yield "".join(key), ["".join(value) for value in row]
+
+    statistics, statistics_duration, statistics_memory = _measure_retained(
+        lambda: OrderedDict((key, dict(zip(captions, row))) for key, row in _fresh_rows())
+    )
+    table, table_duration, table_memory = _measure_retained(lambda: IxnStatisticsTable.from_rows(_fresh_rows(), captions))
+    logger.info(
+        f"table - dict {statistics_duration:.2f}s/{statistics_memory >> 20}MB, "
+        f"columnar {table_duration:.2f}s/{table_memory >> 20}MB"
+    )
+    assert statistics_to_json(table.to_dict()) == statistics_to_json(statistics)
+    assert "".join(iter_csv(table.iter_table())) == _legacy_csv(captions, statistics)
+    assert table_memory < statistics_memory / 2
+
+
+def _measure_retained(func: Callable) -> Tuple[Any, float, int]:
+    """Return func result, duration and memory held by the result."""
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    result = func()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, duration, retained
+
+
+@pytest.mark.parametrize("with_numpy", [True, False])
+def test_statistics_table(monkeypatch: MonkeyPatch, with_numpy: bool) -> None:
+    """Test columnar table text columns, numeric operations, with and without NumPy."""
+    if with_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(ixn_statistics, "numpy", None)
+    captions = ["Tx Port", "Tx Frames", "Loss %", "Store-Forward Avg Latency (ns)"]
+    rows = [
+        ("Flow 1", ["Port 1", "1000", "0.000", "10"]),
+        ("Flow 2", ["Port 2", "2000", "-1.500", "N/A"]),
+        ("Flow 3", ["Port 1", "3000", "25.000", "30"]),
+        ("Flow 4", ["Port 2", "4000", "5.250", "20"]),
+    ]
+    table = IxnStatisticsTable.from_rows(iter(rows), captions)
+    assert len(table) == 4
+    assert not table.numbers
+    assert table.totals() == {"Tx Frames": 10_000, "Loss %": 28.75}
+    assert table.totals(["Tx Frames", "Tx Port"]) == {"Tx Frames": 10_000}
+    assert list(table.iter_rows()) == rows
+
+    latency = table.caption("Avg Latency (ns)")
+    assert latency == "Store-Forward Avg Latency (ns)"
+    assert table.where(latency, lambda v: v >= 20).keys == ["Flow 3", "Flow 4"]
+    assert table.where("Loss %", lambda v: (v < 0) | (v > 10)).to_dict() == {
+        "Flow 2": dict(zip(captions, rows[1][1])),
+        "Flow 3": dict(zip(captions, rows[2][1])),
+    }
+    assert table.top("Loss %", 2).keys == ["Flow 3", "Flow 4"]
+    assert table.top(latency, 5, largest=False).keys == ["Flow 1", "Flow 4", "Flow 3"]
+    assert not table.where("Tx Frames", lambda v: v > 4000)
+    assert list(table.top("Tx Frames", 1).iter_table()) == [captions, rows[3][1]]
+    with pytest.raises(TgnError):
+        table.caption("Rx Frames")
+
+    empty = IxnStatisticsTable.from_rows(iter([]), captions)
+    assert not empty.totals()
+    assert list(empty.iter_table()) == [captions]
+
+    counters = [("Flow 1", ["18446744073709551615", "0.12345678901234567890"]), ("Flow 2", ["9007199254740993", "1.5"])]
+    table = IxnStatisticsTable.from_rows(iter(counters), ["Tx Frames", "Loss %"])
+    assert list(table.iter_rows()) == counters
+    assert table.totals(["Tx Frames"]) == {"Tx Frames": 18446744073709551615 + 9007199254740993}
+    assert table.where("Loss %", lambda v: v > 1).to_dict() == {"Flow 2": dict(zip(["Tx Frames", "Loss %"], counters[1][1]))}
+    assert list(table.numbers) == [1]
+    if not with_numpy:
+        assert table.numeric("Tx Frames") == [18446744073709551615, 9007199254740993]
+
+
+def test_statistics_query() -> None:
+    """Test columns projection, row key filter and numeric conditions."""
+    captions = ["Tx Port", "Tx Frames", "Rx Frames", "Loss %"]
+    rows = [(f"Traffic Item {i % 2}/Flow {i}", [f"Port {i % 4}", str(i * 10), str(i * 9), f"{i:.3f}"]) for i in range(100)]
+    table = IxnStatisticsTable.from_rows(iter(rows), captions, ["Loss %", "Tx Frames"], r"Item 1/Flow \d$")
+    assert table.captions == ["Loss %", "Tx Frames"]
+    assert table.keys == [f"Traffic Item 1/Flow {i}" for i in [1, 3, 5, 7, 9]]
+    assert list(table.iter_rows())[-1] == ("Traffic Item 1/Flow 9", ["9.000", "90"])
+    assert table.select(["Tx Frames"]).to_dict()["Traffic Item 1/Flow 3"] == {"Tx Frames": "30"}
+
+    selected = select_statistics(table, ["Tx Frames"], parse_conditions("Loss % > 2.5; Tx Frames<=70"))
+    assert selected.to_dict() == {f"Traffic Item 1/Flow {i}": {"Tx Frames": str(i * 10)} for i in [3, 5, 7]}
+    table = select_statistics(table, [], parse_conditions("Loss % > 2.5; Tx Frames<=70"))
+    assert table.keys == ["Traffic Item 1/Flow 3", "Traffic Item 1/Flow 5", "Traffic Item 1/Flow 7"]
+    assert IxnStatisticsTable.from_rows(iter([]), captions, ["Rx Frames"]).captions == ["Rx Frames"]
+
+    with pytest.raises(TgnError):
+        IxnStatisticsTable.from_rows(iter(rows), captions, ["Tx Frames", "Rx Bytes"])
+    with pytest.raises(TgnError):
+        table.where("Rx Bytes", lambda v: v > 0)
+    for conditions in ["Loss %", "Loss % > high", "> 5"]:
+        with pytest.raises(TgnError):
+            parse_conditions(conditions)
+
+
+class _PortStatisticsReader:
+    """Minimal IxnStatisticsReader replacement returning incrementing counters."""
+
+    captions = ["Frames Tx.", "Valid Frames Rx."]
+
+    def __init__(self) -> None:
+        """Init counters."""
+        self.frames = 0
+
+    def __str__(self) -> str:
+        """Return view name."""
+        return "Port Statistics"
+
+    def iter_rows(self) -> Iterator[Tuple[str, List[str]]]:
+        """Yield two ports rows."""
+        self.frames += 100
+        yield "Port 1", [str(self.frames), str(self.frames)]
+        yield "Port 2", [str(self.frames), str(self.frames)]
+
+
+def test_statistics_recorder() -> None:
+    """Test background statistics recording."""
+    reader = _PortStatisticsReader()
+    recorder = IxnStatisticsRecorder(
+        [("Port Statistics", None)], lambda view_name, table_key, read: read(reader), 0.05, logger  # type: ignore[arg-type]
+    )
+    recorder.start()
+    time.sleep(0.3)
+    recorder.stop()
+    assert not recorder.is_recording
+    with gzip.open(recorder.files["Port Statistics"], "rt", newline="") as f:
+        rows = list(csv.reader(f))
+    recorder.remove_files()
+    assert rows[0] == ["Time", "Key", "Frames Tx.", "Valid Frames Rx."]
+    assert len(rows) == 1 + 2 * recorder.samples
+    assert rows[-1][1:] == ["Port 2", str(100 * recorder.samples), str(100 * recorder.samples)]
+
+
+class _DeltaReader(IxnStatisticsReader):  # pylint: disable=too-few-public-methods
+    """IxnStatisticsReader over in-memory rows instead of IxNetwork statistics view."""
+
+    def __init__(self) -> None:  # pylint: disable=super-init-not-called
+        """Init empty view and snapshot."""
+        self.captions = ["Port", "Tx Frames", "Loss %"]
+        self.rows: Dict[str, List[str]] = {}
+        self.snapshot: Dict[str, List[str]] = {}
+        self.snapshot_time = 0.0
+        self.rate_captions: List[str] = []
+
+    def iter_rows(self) -> Iterator[Tuple[str, List[str]]]:
+        """Yield the in-memory rows."""
+        yield from ((key, list(row)) for key, row in self.rows.items())
+
+
+def test_read_delta(monkeypatch: MonkeyPatch) -> None:
+    """Test that read_delta returns only changed rows with per second rates of numeric columns."""
+    now = [1000.0]
+    monkeypatch.setattr(ixn_statistics.time, "time", lambda: now[0])
+    reader = _DeltaReader()
+    reader.rows = {"Flow 1": ["Port 1", "100", "0.00"], "Flow 2": ["Port 2", "200", "0.00"]}
+    first = reader.read_delta()
+    assert list(first) == ["Flow 1", "Flow 2"]
+    assert first["Flow 1"] == {"Port": "Port 1", "Tx Frames": "100", "Loss %": "0.00", "Tx Frames Rate": "", "Loss % Rate": ""}
+    assert reader.delta_captions == ["Port", "Tx Frames", "Loss %", "Tx Frames Rate", "Loss % Rate"]
+
+    now[0] += 2
+    reader.rows["Flow 1"] = ["Port 1", "300", "0.00"]
+    reader.rows["Flow 3"] = ["Port 3", "50", "1.50"]
+    second = reader.read_delta()
+    assert list(second) == ["Flow 1", "Flow 3"]
+    assert second["Flow 1"]["Tx Frames Rate"] == "100.00"
+    assert second["Flow 1"]["Loss % Rate"] == "0.00"
+    assert second["Flow 3"]["Tx Frames Rate"] == ""
+
+    now[0] += 1
+    assert reader.read_delta() == {}
+    assert reader.delta_captions == ["Port", "Tx Frames", "Loss %"]
+
+
+@pytest.mark.parametrize(
+    "value, previous_value, interval, rate",
+    [
+        ("300", "100", 2.0, "100.00"),
+        ("100", "300", 2.0, "-100.00"),
+        ("1.5", "0.5", 4.0, "0.25"),
+        ("100", None, 2.0, ""),
+        ("100", "100", 0.0, ""),
+        ("Port 1", "Port 1", 2.0, None),
+        ("100", "N/A", 2.0, None),
+    ],
+)
+def test_rate(value: str, previous_value: Optional[str], interval: float, rate: Optional[str]) -> None:
+    """Test rate per second between two view values."""
+    assert ixn_statistics._rate(value, previous_value, interval) == rate  # pylint: disable=protected-access
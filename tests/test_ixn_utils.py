@@ -0,0 +1,174 @@
+"""
+Test IxNetwork controller shell utilities - no CloudShell or IxNetwork server required.
+"""
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+from _pytest.monkeypatch import MonkeyPatch
+from ixnetwork.ixn_object import IxnObject
+from trafficgenerator.tgn_utils import TgnError
+
+from src.ixn_polling import PollScheduler
+from src.ixn_session_pool import IxnSessionPool, config_uploads
+from src.ixn_utils import ObjectCache, UploadCache, run_concurrently
+
+
+def test_run_concurrently() -> None:
+    """Test that tasks run in parallel, errors are collected and the overall deadline is respected."""
+
+    def _task(duration: float) -> float:
+        if duration < 0:
+            raise ValueError("negative duration")
+        time.sleep(duration)
+        return duration
+
+    start = time.time()
+    results = run_concurrently(_task, {"fast": (0.1,), "slow": (0.5,), "bad": (-1,), "hang": (4,)}, timeout=1, max_workers=4)
+    assert time.time() - start < 2
+    assert results["fast"].ok and results["fast"].result == 0.1
+    assert results["slow"].ok and results["slow"].duration >= 0.5
+    assert isinstance(results["bad"].error, ValueError)
+    assert results["hang"].timed_out
+
+    start = time.time()
+    results = run_concurrently(_task, {"fast": (0.1,), "late": (1.5,)}, timeout=1, join=True)
+    assert time.time() - start >= 1.5
+    assert results["fast"].ok
+    assert results["late"].timed_out and results["late"].result == 1.5
+
+
+def test_object_cache() -> None:
+    """Test cache hits, TTL expiration, LRU eviction and invalidation."""
+    loads = []
+
+    def _loader(key: str) -> str:
+        loads.append(key)
+        return key.upper()
+
+    cache = ObjectCache()
+    assert cache.get("a", lambda: _loader("a")) == "A"
+    assert cache.get("a", lambda: _loader("a")) == "A"
+    assert loads == ["a", "a"]
+
+    loads.clear()
+    cache = ObjectCache(ttl=0.2, max_entries=2)
+    for key in ["a", "a", "b", "a", "c", "a", "b"]:
+        assert cache.get(key, lambda k=key: _loader(k)) == key.upper()
+    assert loads == ["a", "b", "c", "b"]
+    assert cache.get_statistics()["hits"] == 3
+    assert cache.get_statistics()["entries"] == 2
+    time.sleep(0.3)
+    cache.get("a", lambda: _loader("a"))
+    cache.clear()
+    cache.get("a", lambda: _loader("a"))
+    assert loads == ["a", "b", "c", "b", "a", "a"]
+    assert cache.get_statistics()["misses"] == 6
+
+
+def test_upload_cache() -> None:
+    """Test LRU eviction by total size, the last added file is kept even if it exceeds the budget."""
+    cache = UploadCache(max_bytes=100)
+    assert cache.add("a", "a.ixncfg", 40) == []
+    assert cache.add("b", "b.ixncfg", 40) == []
+    assert cache.get("a") == "a.ixncfg"
+    assert cache.add("c", "c.ixncfg", 40) == ["b.ixncfg"]
+    assert cache.get("b") is None
+    assert cache.size == 80
+    cache.remove("a")
+    assert cache.add("d", "d.ixncfg", 200) == ["c.ixncfg"]
+    assert cache.get("d") == "d.ixncfg"
+
+
+def test_poll_scheduler() -> None:
+    """Test backoff, poll at expected completion, timeout and the cap on concurrent polls."""
+    scheduler = PollScheduler(max_in_flight=2, min_interval=0.05, max_interval=0.4, jitter=0)
+
+    def _poll_until(done_time: float) -> bool:
+        return time.time() >= done_time
+
+    start = time.time()
+    assert scheduler.wait("backoff", lambda: _poll_until(start + 1), timeout=10) == 6
+    assert time.time() - start < 1.4
+    start = time.time()
+    assert scheduler.wait("expected", lambda: _poll_until(start + 1), timeout=10, expected=1.01) <= 6
+    assert time.time() - start < 1.1
+    start = time.time()
+    assert scheduler.wait("timeout", lambda: False, timeout=0.5) < 0
+    assert 0.5 <= time.time() - start < 0.6
+    assert scheduler.get_statistics()["polls"]["backoff"] == 6
+
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def _counted_poll() -> bool:
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return True
+
+    run_concurrently(lambda: scheduler.wait("capped", _counted_poll, 1), {str(i): () for i in range(6)}, timeout=2)
+    assert active[1] == 2
+    assert scheduler.get_statistics()["waits"]["capped"] == 6
+
+    nested = PollScheduler(max_in_flight=1)
+    assert nested.wait("outer", lambda: nested.wait("inner", lambda: True, timeout=1) > 0, timeout=1) == 1
+
+
+def _pooled_session(name: str, alive: bool = True, clearable: bool = True) -> SimpleNamespace:
+    """Return minimal IxnApp replacement, connected to dead session if not alive and failing new config if not clearable."""
+
+    def _get_version() -> str:
+        if not alive:
+            raise ConnectionError(f"session {name} closed")
+        return "9.10"
+
+    def _new_config() -> None:
+        if not clearable:
+            raise TgnError(f"session {name} failed to clear")
+
+    ixn = SimpleNamespace(logger=logging.getLogger(name), root=SimpleNamespace(logger=None), disconnected=False)
+    ixn.api = SimpleNamespace(session=name, root_url=f"http://localhost/api/v1/sessions/{name}/", getVersion=_get_version)
+    ixn.new_config = _new_config
+    ixn.disconnect = lambda: setattr(ixn, "disconnected", True)
+    return ixn
+
+
+def test_session_pool(monkeypatch: MonkeyPatch) -> None:
+    """Test session reuse by key, dead and dirty sessions drop, and background eviction of expired sessions."""
+    monkeypatch.setattr(IxnObject, "root", None)
+    logger = logging.getLogger("tgn.ixnetwork")
+    pool = IxnSessionPool()
+    key = ("localhost", 11009, None)
+    assert pool.acquire(key, logger) is None
+
+    session = _pooled_session("reused")
+    pool.release(key, session, 10)  # type: ignore[arg-type]
+    assert pool.acquire(("localhost", 443, "admin"), logger) is None
+    assert pool.acquire(key, logger) is session
+    assert session.logger is logger and IxnObject.root is session.root
+    assert pool.acquire(key, logger) is None
+
+    pool.release(key, _pooled_session("dead", alive=False), 10)  # type: ignore[arg-type]
+    assert pool.acquire(key, logger) is None
+
+    dirty = _pooled_session("dirty", clearable=False)
+    config_uploads[dirty.api.root_url] = {}  # type: ignore[assignment]
+    pool.release(key, dirty, 10)  # type: ignore[arg-type]
+    assert dirty.disconnected
+    assert dirty.api.root_url not in config_uploads
+    assert pool.acquire(key, logger) is None
+
+    expiring = [_pooled_session("short"), _pooled_session("long")]
+    for ixn, ttl in zip(expiring, [0.2, 0.6]):
+        config_uploads[ixn.api.root_url] = {}  # type: ignore[assignment]
+        pool.release(key, ixn, ttl)  # type: ignore[arg-type]
+    time.sleep(0.4)
+    assert [ixn.disconnected for ixn in expiring] == [True, False]
+    time.sleep(0.4)
+    assert all(ixn.disconnected and ixn.api.root_url not in config_uploads for ixn in expiring)
+    assert not pool.sessions[key]
@@ -114,6 +114,26 @@ class TestIxNetworkControllerDriver:
         preferences_attrs = driver.get_attributes(context, obj_ref=preferences_obj)
         assert preferences_attrs["connectPortsOnLoadConfig"] is True
 
+    def test_bulk_hidden_commands(self, driver: IxNetworkController2GDriver, context: ResourceCommandContext) -> None:
+        """Test bulk hidden commands - get_attributes_bulk, set_attributes_bulk and get_subtree."""
+        session_id = driver.get_session_id(context)
+        root_obj = f"{session_id}ixnetwork"
+        globals_tree = driver.get_subtree(context, obj_ref=f"{root_obj}/globals", depth="1", child_types="preferences")
+        preferences_obj = globals_tree["preferences"][0]["href"]
+        attributes = [[preferences_obj, {"connectPortsOnLoadConfig": False}]]
+        driver.set_attributes_bulk(context, attributes=json.dumps(attributes))
+        obj_refs = [[preferences_obj, ["connectPortsOnLoadConfig"]]]
+        objects_attrs = driver.get_attributes_bulk(context, obj_refs=json.dumps(obj_refs))
+        assert objects_attrs[preferences_obj]["connectPortsOnLoadConfig"] is False
+        attributes = [[preferences_obj, {"connectPortsOnLoadConfig": True}]]
+        driver.set_attributes_bulk(context, attributes=json.dumps(attributes))
+        objects_attrs = driver.get_attributes_bulk(context, obj_refs=json.dumps([preferences_obj, f"{root_obj}/globals"]))
+        assert objects_attrs[preferences_obj]["connectPortsOnLoadConfig"] is True
+        assert "buildNumber" in objects_attrs[f"{root_obj}/globals"]
+        metrics = driver.get_performance_metrics(context, prometheus_file="")
+        assert metrics["set_attributes_bulk"]["count"] == 2
+        assert metrics["get_subtree"]["rest_requests"] >= 1
+
     def test_load_config(self, driver: IxNetworkController2GDriver, context: ResourceCommandContext, server: list) -> None:
         """Test load configuration command."""
         self._load_config(driver, context, server, "test_config")
@@ -135,6 +155,8 @@ class TestIxNetworkControllerDriver:
         stats = driver.get_statistics(context, "Port Statistics", "JSON", "")
         assert int(stats["Port 1"]["Frames Tx."]) >= 2000
         driver.get_statistics(context, "Port Statistics", "csv", "")
+        verdict = driver.get_traffic_verdict(context, "Traffic Item Statistics", "100")
+        assert verdict["verdict"] == "PASS"
         driver.stop_protocols(context)
 
     def test_run_quick_test(self, driver: IxNetworkController2GDriver, context: ResourceCommandContext, server: list) -> None:
@@ -142,6 +164,26 @@ class TestIxNetworkControllerDriver:
         self._load_config(driver, context, server, "quick_test")
         driver.run_quick_test(context, "QuickTest1")
 
+    def test_run_quick_tests(self, driver: IxNetworkController2GDriver, context: ResourceCommandContext, server: list) -> None:
+        """Test run_quick_tests command."""
+        self._load_config(driver, context, server, "quick_test")
+        summary = driver.run_quick_tests(context, "QuickTest1")
+        assert len(summary.splitlines()) == 2
+        with pytest.raises(TgnError):
+            driver.run_quick_tests(context, "QuickTest1, QuickTestX")
+
+    def test_poll_quick_test(self, driver: IxNetworkController2GDriver, context: ResourceCommandContext, server: list) -> None:
+        """Test start_quick_test, get_quick_test_status and collect_quick_test_results commands."""
+        self._load_config(driver, context, server, "quick_test")
+        driver.start_quick_test(context, "QuickTest1")
+        with pytest.raises(TgnError):
+            driver.collect_quick_test_results(context, "QuickTest1")
+        status = driver.get_quick_test_status(context, "QuickTest1")
+        while status["isRunning"]:
+            time.sleep(4)
+            status = driver.get_quick_test_status(context, "QuickTest1")
+        assert driver.collect_quick_test_results(context, "QuickTest1").endswith(".pdf")
+
     def test_negative(self, driver: IxNetworkController2GDriver, context: ResourceCommandContext, server: list) -> None:
         """Negative tests."""
         reservation_ports = get_resources_from_reservation(context, f"{IXIA_CHASSIS_MODEL}.GenericTrafficGeneratorPort")